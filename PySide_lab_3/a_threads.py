@@ -2,38 +2,156 @@
 Модуль в котором содержаться потоки Qt
 """
 
+import random
+import threading
 import time
-import psutil
 from PySide6 import QtCore
-from PySide6.QtCore import Signal, QThread, QObject, Slot
+from PySide6.QtCore import Signal, QThread
 import requests
+from requests.adapters import HTTPAdapter
+
+from collectors import BatchBuilder, default_collectors
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def http_session():
+    """Общая для всех потоков сессия requests: пул соединений с keep-alive."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
 
 
 class SystemInfo(QtCore.QThread):
-    systemInfoReceived = Signal(list)  # Создайте экземпляр класса Signal и передайте ему в конструктор тип данных передаваемого значения (в текущем случае list)
+    """
+    Поток опроса показателей системы с периодом delay секунд.
+
+    Отсчёты идут по расписанию от time.monotonic() (n-й отсчёт через n * delay
+    от запуска), поэтому время сбора и доставки сигнала не накапливается.
+    Загрузка CPU берётся без ожидания (cpu_percent(interval=None)) - это доля
+    занятости процессора с предыдущего отсчёта. Ожидание прерывается сразу при
+    смене задержки и при остановке.
+
+    Показатели собирают сборщики из модуля collectors. Отсчёты копятся в
+    пачку и отправляются сигналом samplesReceived не чаще max_emit_rate раз в
+    секунду, поэтому частый опрос не засыпает очередь событий GUI сигналами.
+    """
+    systemInfoReceived = Signal(list)  # [загрузка CPU, загрузка RAM] последнего отсчёта пачки, в процентах
+    samplesReceived = Signal(object)  # collectors.SampleBatch
+    MIN_DELAY = 0.05
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, collectors=None, max_emit_rate=10):
+        """
+        :param collectors: сборщики показателей (None - collectors.default_collectors())
+        :param max_emit_rate: сколько раз в секунду можно отправлять пачку в GUI
+        """
+        if max_emit_rate <= 0:
+            raise ValueError(f"max_emit_rate должен быть больше нуля: {max_emit_rate}")
         super().__init__(parent)
-        self.delay = 1  #   Cоздайте атрибут класса self.delay = None, для управлением задержкой получения данных (Начальная задержка в секунду)
+        self._wakeup = threading.Event()
+        # Запрос остановки: run() его не сбрасывает, поэтому stop() сразу после start() не теряется
+        self._stopping = threading.Event()
+        self._delay = 1  # Начальная задержка в секунду
+        self.max_emit_rate = max_emit_rate
+        self.batch = BatchBuilder(default_collectors() if collectors is None else collectors)
+
+    @property
+    def delay(self):
+        return self._delay
+
+    @delay.setter
+    def delay(self, value):
+        self._delay = max(self.MIN_DELAY, value)
+        self._wakeup.set()
+
+    def setDelay(self, new_delay) -> None:
+        """Новый период опроса, действует сразу (в том числе доли секунды)."""
+        self.delay = new_delay
+
+    @property
+    def running(self):
+        return self.isRunning() and not self._stopping.is_set()
+
+    def start(self, *args) -> None:
+        self._stopping.clear()
+        super().start(*args)
+
+    def stop(self) -> None:
+        """Остановка потока без ожидания конца текущего периода."""
+        self._stopping.set()
+        self._wakeup.set()
+        self.wait()
+
+    def run(self) -> None:
+        last = time.monotonic()  # Плановое время последнего отсчёта
+        self.batch.prime(last)  # CPU и счётчики дисков/сети считаются от этого момента
+        deadline = last + self.delay
+        emitted = 0.0
+        while not self._stopping.is_set():
+            timeout = deadline - time.monotonic()
+            if timeout > 0 and self._wakeup.wait(timeout):
+                # Сменилась задержка (или поток останавливают): срок считается заново от последнего отсчёта.
+                # Событие сбрасывается только после пробуждения, иначе можно потерять вызов stop()
+                self._wakeup.clear()
+                deadline = last + self.delay
+                continue
+            self.batch.sample(time.monotonic())
+            now = time.monotonic()
+            if now - emitted >= 1 / self.max_emit_rate:
+                self.emit_batch()
+                emitted = now
+            last, deadline = deadline, deadline + self.delay
+            if deadline <= now:
+                # Пропущенные отсчёты (поток не успевал, система спала) не догоняются
+                deadline += ((now - deadline) // self.delay + 1) * self.delay
+        if len(self.batch):
+            self.emit_batch()
 
-    def run(self) -> None:  # переопределить метод run
-        while True:  # Запустите бесконечный цикл получения информации о системе
-            cpu_value = psutil.cpu_percent(interval=1)  # с помощью вызова функции cpu_percent() в пакете psutil получите загрузку CPU
-            ram_value = psutil.virtual_memory().percent  # с помощью вызова функции virtual_memory().percent в пакете psutil получите загрузку RAM
-            self.systemInfoReceived.emit([cpu_value, ram_value])  # с помощью метода .emit передайте в виде списка данные о загрузке CPU и RAM
-            time.sleep(self.delay)  # с помощью функции .sleep() приостановите выполнение цикла на время self.delay
+    def emit_batch(self) -> None:
+        batch = self.batch.take()
+        self.samplesReceived.emit(batch)
+        if "cpu" in batch.channels and "ram" in batch.channels:
+            latest = batch.latest()
+            self.systemInfoReceived.emit([latest["cpu"], latest["ram"]])
 
 
 class WeatherHandler(QThread):
+    """
+    Поток запросов текущей погоды в open-meteo раз в delay секунд.
+
+    Запросы идут через общую сессию requests (http_session): соединение с
+    сервером переиспользуется (keep-alive), а не открывается заново на каждый
+    запрос. У запроса есть таймауты на подключение и чтение. После ошибки
+    следующий запрос откладывается экспоненциально (с разбросом, чтобы
+    несколько клиентов не повторяли запросы одновременно), ошибки передаются
+    сигналом errorOccurred. Ожидание прерывается при остановке (stop).
+    """
     weatherDataReceived = Signal(dict)
-    # Пропишите сигналы, которые считаете нужными
+    errorOccurred = Signal(str)  # Текст ошибки запроса
+    BASE_URL = "https://api.open-meteo.com/v1/forecast"
+    TIMEOUT = (3.05, 10)  # Подключение и чтение ответа, секунды
+    MAX_BACKOFF = 300
 
-    def __init__(self, latitude, longitude, parent=None):
+    def __init__(self, latitude, longitude, parent=None, base_url=BASE_URL, timeout=TIMEOUT, session=None):
+        """
+        :param base_url: адрес API (например, локальный сервер-заглушка)
+        :param session: сессия requests (None - общая http_session())
+        """
         super().__init__(parent)
 
-        self.api_url = f"https://api.open-meteo.com/v1/forecast?latitude={latitude}&longitude={longitude}&current_weather=true"
+        self.api_url = f"{base_url}?latitude={latitude}&longitude={longitude}&current_weather=true"
         self.delay = 10
         self.status = True
+        self.timeout = timeout
+        self.session = session or http_session()
+        self.failures = 0  # Ошибок подряд
+        self._wakeup = threading.Event()
 
     def setDelay(self, new_delay) -> None:
         """
@@ -41,20 +159,37 @@ class WeatherHandler(QThread):
         """
         self.delay = new_delay
 
+    def stop(self) -> None:
+        """Остановка потока без ожидания конца паузы между запросами."""
+        self.status = False
+        self._wakeup.set()
+        self.wait()
 
-    def run(self) -> None:
-        # настройте метод для корректной работы
+    def backoff(self, retry_after=None) -> float:
+        """Пауза после self.failures ошибок подряд: delay * 2^n, не больше MAX_BACKOFF, половина - случайная."""
+        pause = min(self.MAX_BACKOFF, self.delay * 2 ** self.failures)
+        pause = pause / 2 + random.uniform(0, pause / 2)
+        return max(pause, retry_after or 0)
 
+    def run(self) -> None:
         while self.status:
+            retry_after = None
             try:
-                response = requests.get(self.api_url)
+                response = self.session.get(self.api_url, timeout=self.timeout)
                 if response.ok:
                     data = response.json()["current_weather"]
+                    self.failures = 0
                     self.weatherDataReceived.emit(data)
                 else:
-                    print(f'Ошибка при получении данных: {response.status_code}')
-            except Exception as e:
-                print(f'Ошибка обработки запроса: {e}')
-            finally:
-                time.sleep(self.delay)
-
+                    self.failures += 1
+                    # 429 и 503 могут прийти с заголовком Retry-After в секундах
+                    header = response.headers.get("Retry-After", "")
+                    retry_after = float(header) if header.isdigit() else None
+                    self.errorOccurred.emit(f'Ошибка при получении данных: {response.status_code}')
+            except requests.Timeout:
+                self.failures += 1
+                self.errorOccurred.emit('Сервер погоды не ответил вовремя')
+            except (requests.RequestException, ValueError, KeyError, TypeError) as e:
+                self.failures += 1
+                self.errorOccurred.emit(f'Ошибка обработки запроса: {e}')
+            self._wakeup.wait(self.backoff(retry_after) if self.failures else self.delay)
@@ -11,22 +11,40 @@
 5. установку времени задержки сделать "горячей", т.е. поток должен сразу
 реагировать на изменение времени задержки
 """
+import argparse
 import sys
+import time
 from PySide6.QtWidgets import *
 from a_threads import *
+from metrics_archive import MetricsArchive, default_directory
+from metrics_history import MetricsHistory
+from metrics_service import MetricsService
+from sparkline import Sparkline
+
+
+def rate(latest, channel):
+    """Скорость канала последнего отсчёта в МБ/с или прочерк, если сборщика нет."""
+    value = latest.get(channel)
+    return "-" if value is None else f"{value / 2 ** 20:.2f} МБ/с"
+
 
 class MainWindow(QWidget):
-    def __init__(self):
+    def __init__(self, archive=None, history_hours=24):
+        """
+        :param archive: MetricsArchive, из которого при запуске берутся графики последних history_hours часов
+        """
         super().__init__()
+        self.history = MetricsHistory(("cpu", "ram"))
+        if archive is not None:
+            self.history.extend(archive.load(since=time.time() - history_hours * 3600, channels=self.history.channels))
         self.initUI()
 
-        # Запуск потоков сбора данных
-        self.sysinfo_thread = SystemInfo()
-        self.sysinfo_thread.systemInfoReceived.connect(self.update_system_info)
-        self.sysinfo_thread.start()
+        # Подписка на общий сбор показателей и запуск потока погоды
+        self.metrics = MetricsService.instance().subscribe(self.update_samples, interval=1)
 
         self.weather_thread = WeatherHandler(latitude=55.7522, longitude=37.6156)  # Координаты Москвы
         self.weather_thread.weatherDataReceived.connect(self.update_weather_data)
+        self.weather_thread.errorOccurred.connect(self.show_weather_error)
         self.weather_thread.start()
 
     def initUI(self):
@@ -35,7 +53,7 @@ class MainWindow(QWidget):
         # Поле для установки интервала опроса
         self.delay_input = QLineEdit("1")
         self.delay_input.textChanged.connect(self.change_delay)
-        layout.addWidget(QLabel("Интервал опроса (секунды):"))
+        layout.addWidget(QLabel("Интервал опроса (секунды, можно дробный):"))
         layout.addWidget(self.delay_input)
 
         # Индикатор CPU
@@ -46,6 +64,22 @@ class MainWindow(QWidget):
         self.ram_label = QLabel("Использование RAM: ")
         layout.addWidget(self.ram_label)
 
+        # Графики по всей накопленной истории
+        self.cpu_chart = Sparkline(self.history, "cpu", color="#2a82da")
+        layout.addWidget(self.cpu_chart)
+        self.ram_chart = Sparkline(self.history, "ram", color="#3c9d4c")
+        layout.addWidget(self.ram_chart)
+
+        # Средняя загрузка, диски и сеть, процессы, время сбора
+        self.load_label = QLabel("Средняя загрузка: ")
+        layout.addWidget(self.load_label)
+        self.io_label = QLabel("Диск / сеть: ")
+        layout.addWidget(self.io_label)
+        self.processes_label = QLabel("Процессы: ")
+        layout.addWidget(self.processes_label)
+        self.cost_label = QLabel("Сбор данных: ")
+        layout.addWidget(self.cost_label)
+
         # Погода
         self.temperature_label = QLabel("Температура:")
         layout.addWidget(self.temperature_label)
@@ -63,15 +97,39 @@ class MainWindow(QWidget):
         self.cpu_label.setText(f"Загрузка CPU: {cpu_usage}%")
         self.ram_label.setText(f"Использование RAM: {ram_usage}%")
 
+    def update_samples(self, batch):
+        """ Пачка отсчётов SystemInfo: история для графиков и остальные показатели """
+        latest = batch.latest()
+        # Набор каналов зависит от сборщиков SystemInfo: показываются только те, что есть в пачке
+        if "cpu" in latest and "ram" in latest:
+            self.history.extend(batch)
+            self.cpu_chart.update()
+            self.ram_chart.update()
+            self.update_system_info([latest["cpu"], latest["ram"]])
+        loads = " ".join(f"{latest[channel]:.2f}" for channel in ("load1", "load5", "load15") if channel in latest)
+        self.load_label.setText(f"Средняя загрузка: {loads or '-'}")
+        self.io_label.setText(f"Диск: чтение {rate(latest, 'disk_read')}, запись {rate(latest, 'disk_write')}\n"
+                              f"Сеть: приём {rate(latest, 'net_recv')}, передача {rate(latest, 'net_sent')}")
+        processes = batch.details.get("processes", [])
+        self.processes_label.setText("Процессы:\n" + "\n".join(
+            f"{name} ({pid}): CPU {cpu_usage:.0f}%, {rss:.0f} МБ" for pid, name, cpu_usage, rss in processes))
+        self.cost_label.setText(f"Сбор данных: {batch.costs['total']:.2f} мс/отсчёт, отсчётов в пачке: {len(batch)}")
+        self.cost_label.setToolTip("\n".join(f"{name}: {cost:.3f} мс" for name, cost in batch.costs.items()))
+
     def change_delay(self, text):
         """ Изменение интервала опроса """
         try:
-            new_delay = int(text.strip())
+            new_delay = float(text.strip().replace(",", "."))
             if new_delay > 0:
-                self.sysinfo_thread.delay = new_delay
+                self.metrics.setInterval(new_delay)
         except ValueError:
             pass
 
+    def closeEvent(self, event):
+        self.metrics.cancel()
+        self.weather_thread.stop()
+        super().closeEvent(event)
+
     def update_weather_data(self, weather_data):
         """ Обновление метеоданных """
         temperature = weather_data['temperature']
@@ -79,9 +137,41 @@ class MainWindow(QWidget):
         self.temperature_label.setText(f"Температура: {temperature}°C")
         self.wind_speed_label.setText(f"Скорость ветра: {wind_speed} м/с")
 
+    def show_weather_error(self, message):
+        """ Ошибка запроса погоды: последние данные остаются, причина - в подсказке """
+        self.temperature_label.setToolTip(message)
+        self.wind_speed_label.setToolTip(message)
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Загрузка системы и погода")
+    parser.add_argument("--archive", default=default_directory(),
+                        help="каталог архива отсчётов (по умолчанию в каталоге данных пользователя)")
+    parser.add_argument("--no-archive", action="store_true", help="не писать и не читать архив")
+    parser.add_argument("--history-hours", type=float, default=24, help="сколько часов архива показать при запуске")
+    parser.add_argument("--prometheus-port", type=int, default=None,
+                        help="отдавать показатели на http://127.0.0.1:PORT/metrics")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    service = MetricsService.instance()
+    archive = None if args.no_archive else MetricsArchive(args.archive)
+    exporter = None
+    if args.prometheus_port is not None:
+        from prometheus_exporter import PrometheusExporter
+        exporter = PrometheusExporter(port=args.prometheus_port).start()
+        service.subscribe(exporter.update, interval=1)
+    window = MainWindow(archive, args.history_hours)
+    if archive is not None:
+        service.subscribe(archive.append, interval=1)
+    code = app.exec()
+    if archive is not None:
+        archive.close()
+    if exporter is not None:
+        exporter.close()
+    return code
 
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = MainWindow()
-    sys.exit(app.exec())
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
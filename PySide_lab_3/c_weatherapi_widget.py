@@ -82,6 +82,7 @@ class MainWindow(QWidget):
             self.thread = WeatherHandler(lat, lon)
             self.thread.setDelay(interval)
             self.thread.weatherDataReceived.connect(self.update_weather_data)
+            self.thread.errorOccurred.connect(self.show_error)
             self.thread.finished.connect(self.on_thread_finished)
             self.thread.start()
             self.is_running = True
@@ -93,8 +94,7 @@ class MainWindow(QWidget):
     def stop_thread(self):
         """Останавливает поток и разблокирует поля ввода."""
         if self.thread is not None and self.is_running:
-            self.thread.status = False
-            self.thread.wait()
+            self.thread.stop()
             self.thread.deleteLater()
             self.thread = None
 
@@ -112,6 +112,10 @@ class MainWindow(QWidget):
         text = f"Температура: {temperature:.1f}°C\nСкорость ветра: {wind_speed:.1f} м/с"
         self.weather_label.setText(text)
 
+    def show_error(self, message):
+        """Показывает ошибку запроса (поток повторит запрос позже)."""
+        self.weather_label.setText(f"{message}\nПовторный запрос позже.")
+
     def on_thread_finished(self):
         """Выполняется при завершении потока."""
         self.stop_thread()
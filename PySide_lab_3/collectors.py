@@ -0,0 +1,249 @@
+"""
+Сборщики показателей системы для потока SystemInfo.
+
+Каждый сборщик отдаёт за отсчёт список чисел в порядке своих каналов
+(channels). Поток склеивает значения всех сборщиков в одну строку
+[время, значения...] и копит строки в одном array('d'), а в GUI раз в
+несколько отсчётов уходит пачка SampleBatch, а не список на каждый показатель.
+Дорогие сборщики (список процессов) запускаются не чаще чем раз в period
+секунд, между запусками отдаются прежние значения.
+"""
+import time
+from array import array
+
+import psutil
+
+
+class Collector:
+    """Базовый сборщик: имя, каналы и значения за отсчёт."""
+    name = ""
+    period = 0.0  # Минимальный промежуток между запусками collect, секунды
+
+    def __init__(self):
+        self.last = None
+        self.last_time = None
+
+    def channels(self):
+        """Имена каналов в порядке значений collect."""
+        raise NotImplementedError
+
+    def collect(self, now):
+        """Значения каналов; now - время отсчёта по time.monotonic()."""
+        raise NotImplementedError
+
+    def details(self):
+        """Нечисловые подробности последнего запуска (для GUI) или None."""
+        return None
+
+    def sample(self, now):
+        if self.last is None or now - self.last_time >= self.period:
+            self.last = self.collect(now)
+            self.last_time = now
+        return self.last
+
+
+class CpuRam(Collector):
+    """Общая загрузка CPU и RAM в процентах."""
+    name = "cpu_ram"
+
+    def channels(self):
+        return ["cpu", "ram"]
+
+    def collect(self, now):
+        return [psutil.cpu_percent(interval=None), psutil.virtual_memory().percent]
+
+
+class PerCoreCpu(Collector):
+    """Загрузка каждого логического ядра в процентах."""
+    name = "cores"
+
+    def channels(self):
+        return [f"cpu{k}" for k in range(psutil.cpu_count() or 1)]
+
+    def collect(self, now):
+        return psutil.cpu_percent(interval=None, percpu=True)
+
+
+class LoadAverage(Collector):
+    """Средняя загрузка системы за 1, 5 и 15 минут (на Windows psutil её эмулирует)."""
+    name = "load"
+
+    def channels(self):
+        return ["load1", "load5", "load15"]
+
+    def collect(self, now):
+        return list(psutil.getloadavg())
+
+
+class CounterRate(Collector):
+    """Скорость роста счётчиков (байт в секунду); первый отсчёт - нули."""
+    fields = ()
+
+    def __init__(self):
+        super().__init__()
+        self.previous = None
+
+    def counters(self):
+        raise NotImplementedError
+
+    def collect(self, now):
+        counters = self.counters()
+        values = [float(getattr(counters, field)) for field in self.fields] if counters else [0.0] * len(self.fields)
+        previous, self.previous = self.previous, (now, values)
+        if previous is None or now <= previous[0]:
+            return [0.0] * len(self.fields)
+        elapsed = now - previous[0]
+        return [max(0.0, value - old) / elapsed for value, old in zip(values, previous[1])]
+
+
+class DiskIO(CounterRate):
+    """Чтение и запись на все диски, байт/с."""
+    name = "disk"
+    fields = ("read_bytes", "write_bytes")
+
+    def channels(self):
+        return ["disk_read", "disk_write"]
+
+    def counters(self):
+        return psutil.disk_io_counters()
+
+
+class NetIO(CounterRate):
+    """Приём и передача по всем интерфейсам, байт/с."""
+    name = "net"
+    fields = ("bytes_recv", "bytes_sent")
+
+    def channels(self):
+        return ["net_recv", "net_sent"]
+
+    def counters(self):
+        return psutil.net_io_counters()
+
+
+class TopProcesses(Collector):
+    """
+    n процессов с наибольшей загрузкой CPU (key="cpu") или памятью (key="rss").
+
+    Каналы на каждое место: pid, CPU в процентах (до 100 * число ядер), RSS в МБ;
+    пустые места - нули. Имена процессов - в details().
+    """
+    name = "processes"
+
+    def __init__(self, n=5, key="cpu", period=2.0):
+        super().__init__()
+        self.n = n
+        self.key = key
+        self.period = period
+        self.top = []
+
+    def channels(self):
+        return [f"top{k}_{field}" for k in range(self.n) for field in ("pid", "cpu", "rss")]
+
+    def collect(self, now):
+        processes = []
+        # process_iter хранит объекты Process между вызовами, поэтому cpu_percent считается от прошлого запуска
+        for process in psutil.process_iter(["name", "cpu_percent", "memory_info"]):
+            info = process.info
+            rss = info["memory_info"].rss / 2 ** 20 if info["memory_info"] else 0.0
+            processes.append((process.pid, info["name"] or "", info["cpu_percent"] or 0.0, rss))
+        processes.sort(key=(lambda p: p[2]) if self.key == "cpu" else (lambda p: p[3]), reverse=True)
+        self.top = processes[:self.n]
+        values = []
+        for pid, _, cpu, rss in self.top:
+            values += [pid, cpu, rss]
+        return values + [0.0] * (3 * self.n - len(values))
+
+    def details(self):
+        return self.top
+
+
+def default_collectors():
+    """Все сборщики: CPU/RAM, ядра, средняя загрузка, диски, сеть, 5 процессов по CPU."""
+    return [CpuRam(), PerCoreCpu(), LoadAverage(), DiskIO(), NetIO(), TopProcesses()]
+
+
+class SampleBatch:
+    """
+    Отсчёты между двумя сигналами потока.
+
+    data - строки [время (time.time()), значения channels...] подряд в одном
+    array('d'); costs - среднее время запуска каждого сборщика за отсчёт, мс
+    (под ключом "total" - всех вместе); details - подробности сборщиков.
+    """
+
+    def __init__(self, channels, data, costs, details):
+        self.channels = channels
+        self.data = data
+        self.costs = costs
+        self.details = details
+        self.width = len(channels) + 1
+
+    def __len__(self):
+        return len(self.data) // self.width
+
+    def row(self, i):
+        """(время, значения) i-го отсчёта; отрицательный i - с конца."""
+        i %= len(self)
+        start = i * self.width
+        return self.data[start], self.data[start + 1:start + self.width]
+
+    def rows(self):
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def column(self, channel):
+        """Значения канала во всех отсчётах пачки."""
+        offset = self.channels.index(channel) + 1
+        return self.data[offset::self.width]
+
+    def select(self, indices):
+        """Пачка только из отсчётов с номерами indices (прореживание для подписчика)."""
+        data = array('d')
+        for i in indices:
+            data.extend(self.data[i * self.width:(i + 1) * self.width])
+        return SampleBatch(self.channels, data, self.costs, self.details)
+
+    def latest(self):
+        """Словарь канал -> значение последнего отсчёта."""
+        return dict(zip(self.channels, self.row(-1)[1]))
+
+
+class BatchBuilder:
+    """Накопление отсчётов и времени работы сборщиков до отправки пачки."""
+
+    def __init__(self, collectors):
+        self.collectors = list(collectors)
+        self.channels = [channel for collector in self.collectors for channel in collector.channels()]
+        self.reset()
+
+    def reset(self):
+        self.data = array('d')
+        self.costs = [0.0] * len(self.collectors)
+
+    def __len__(self):
+        return len(self.data) // (len(self.channels) + 1)
+
+    def prime(self, now):
+        """Первый запуск сборщиков: счётчики-разности запоминают начальные значения."""
+        for collector in self.collectors:
+            collector.sample(now)
+
+    def sample(self, now):
+        """Один отсчёт всех сборщиков в конец пачки."""
+        self.data.append(time.time())
+        for k, collector in enumerate(self.collectors):
+            started = time.perf_counter()
+            values = collector.sample(now)
+            self.costs[k] += time.perf_counter() - started
+            self.data.extend(values)
+
+    def take(self):
+        """Готовая пачка; накопление начинается заново."""
+        count = len(self) or 1
+        costs = {collector.name: cost * 1000 / count for collector, cost in zip(self.collectors, self.costs)}
+        costs["total"] = sum(self.costs) * 1000 / count
+        details = {collector.name: collector.details() for collector in self.collectors
+                   if collector.details() is not None}
+        batch = SampleBatch(self.channels, self.data, costs, details)
+        self.reset()
+        return batch
@@ -6,56 +6,18 @@ from PySide6.QtGui import QFont
 from PySide6.QtWidgets import *
 
 from a_threads import *
-
-class SystemInfo(QThread):
-    systemInfoReceived = Signal(list)  # Сигнал для передачи списка с информацией о ресурсах
-
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.delay = 1  # Начальная задержка в секунду
-
-    def run(self) -> None:
-        while True:
-            cpu_value = psutil.cpu_percent(interval=1)  # Процент нагрузки на процессор
-            ram_value = psutil.virtual_memory().percent  # Процент используемой оперативной памяти
-            self.systemInfoReceived.emit([cpu_value, ram_value])
-            time.sleep(self.delay)
-
-class WeatherHandler(QThread):
-    weatherDataReceived = Signal(dict)  # Сигнал для отправки данных о погоде
-
-    def __init__(self, latitude, longitude, parent=None):
-        super().__init__(parent)
-        self.api_url = f"https://api.open-meteo.com/v1/forecast?latitude={latitude}&longitude={longitude}&current_weather=true"
-        self.delay = 10  # Интервал запросов составляет 10 секунд
-        self.status = True  # Флаг активности потока
-
-    def setDelay(self, new_delay):
-        self.delay = new_delay
-
-    def run(self) -> None:
-        while self.status:
-            try:
-                response = requests.get(self.api_url)
-                if response.ok:
-                    data = response.json()["current_weather"]
-                    self.weatherDataReceived.emit(data)
-                else:
-                    print(f'Ошибка при получении данных: {response.status_code}')
-            except Exception as e:
-                print(f'Ошибка обработки запроса: {e}')
-            finally:
-                time.sleep(self.delay)
+from metrics_history import MetricsHistory
+from metrics_service import MetricsService
+from sparkline import Sparkline
 
 class MainWindow(QWidget):
     def __init__(self):
         super().__init__()
+        self.history = MetricsHistory(("cpu", "ram"))
         self.initUI()
 
-        # Запуск потоков сбора данных
-        self.sysinfo_thread = SystemInfo()
-        self.sysinfo_thread.systemInfoReceived.connect(self.update_system_info)
-        self.sysinfo_thread.start()
+        # Подписка на общий сбор показателей (поток тот же, что у других окон)
+        self.metrics = MetricsService.instance().subscribe(self.update_samples, interval=1)
 
     def initUI(self):
         layout = QVBoxLayout()
@@ -63,7 +25,7 @@ class MainWindow(QWidget):
         # Поле для установки интервала опроса
         self.delay_input = QLineEdit("1")
         self.delay_input.textChanged.connect(self.change_delay)
-        layout.addWidget(QLabel("Интервал опроса (секунды):"))
+        layout.addWidget(QLabel("Интервал опроса (секунды, можно дробный):"))
         layout.addWidget(self.delay_input)
 
         # Индикатор CPU Load
@@ -74,6 +36,12 @@ class MainWindow(QWidget):
         self.ram_label = QLabel("Использование RAM: ")
         layout.addWidget(self.ram_label)
 
+        # Графики по всей накопленной истории
+        self.cpu_chart = Sparkline(self.history, "cpu", color="#2a82da")
+        layout.addWidget(self.cpu_chart)
+        self.ram_chart = Sparkline(self.history, "ram", color="#3c9d4c")
+        layout.addWidget(self.ram_chart)
+
         # Поля ввода координат
         hbox_lat_long = QHBoxLayout()
         label_lat = QLabel("Широта:")
@@ -118,12 +86,22 @@ class MainWindow(QWidget):
         self.cpu_label.setText(f"Загрузка CPU: {cpu_usage}%")
         self.ram_label.setText(f"Использование RAM: {ram_usage}%")
 
+    def update_samples(self, batch):
+        """ Пачка отсчётов: история для графиков и последние значения CPU и RAM """
+        latest = batch.latest()
+        # Со своими сборщиками у SystemInfo может не быть каналов CPU и RAM
+        if "cpu" in latest and "ram" in latest:
+            self.history.extend(batch)
+            self.cpu_chart.update()
+            self.ram_chart.update()
+            self.update_system_info([latest["cpu"], latest["ram"]])
+
     def change_delay(self, text):
         """ Изменение интервала опроса """
         try:
-            new_delay = int(text.strip())
+            new_delay = float(text.strip().replace(",", "."))
             if new_delay > 0:
-                self.sysinfo_thread.delay = new_delay
+                self.metrics.setInterval(new_delay)
         except ValueError:
             pass
 
@@ -143,6 +121,7 @@ class MainWindow(QWidget):
             self.weather_thread = WeatherHandler(lat, lon)
             self.weather_thread.setDelay(interval)
             self.weather_thread.weatherDataReceived.connect(self.update_weather_data)
+            self.weather_thread.errorOccurred.connect(self.show_weather_error)
             self.weather_thread.finished.connect(self.on_thread_finished)
             self.weather_thread.start()
             self.is_running = True
@@ -154,8 +133,7 @@ class MainWindow(QWidget):
     def stop_thread(self):
         """Останавливает поток и разблокирует поля ввода."""
         if hasattr(self, 'weather_thread') and self.weather_thread.isRunning():
-            self.weather_thread.status = False
-            self.weather_thread.wait()
+            self.weather_thread.stop()
             del self.weather_thread
 
         # Разблокировка полей ввода
@@ -172,6 +150,15 @@ class MainWindow(QWidget):
         text = f"Температура: {temperature:.1f}°C\nСкорость ветра: {wind_speed:.1f} м/с"
         self.weather_label.setText(text)
 
+    def closeEvent(self, event):
+        self.metrics.cancel()
+        self.stop_thread()
+        super().closeEvent(event)
+
+    def show_weather_error(self, message):
+        """Показывает ошибку запроса (поток повторит запрос позже)."""
+        self.weather_label.setText(f"{message}\nПовторный запрос позже.")
+
     def on_thread_finished(self):
         """Выполняется при завершении потока."""
         self.stop_thread()
@@ -0,0 +1,199 @@
+"""
+Архив отсчётов SystemInfo на диске с ротацией по размеру и времени.
+
+Архив - каталог файлов-сегментов metrics-<начало в мс>.bin. Сегмент:
+заголовок (MAGIC, версия, число каналов, имена каналов через перевод строки,
+выравнивание до 8 байт) и строки [время, значения каналов...] из float64
+подряд, как в SampleBatch.data. Поэтому пачка пишется в файл одним write, а
+при загрузке сегмент отображается в память (mmap) и читается как массив
+double без разбора.
+
+Новый сегмент начинается, когда текущий больше segment_bytes или старше
+segment_seconds, а также при смене набора каналов. Старые сегменты удаляются,
+когда архив больше max_bytes или их отсчёты старше max_age секунд.
+"""
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+
+from collectors import SampleBatch
+
+MAGIC = b"MTRA"
+VERSION = 1
+HEADER = struct.Struct("<4sHHI")  # MAGIC, версия, число каналов, длина имён в байтах
+PREFIX = "metrics-"
+SUFFIX = ".bin"
+
+
+def default_directory():
+    """Каталог архива в каталоге данных пользователя (XDG_DATA_HOME, на Windows - APPDATA)."""
+    if sys.platform == "win32" and os.environ.get("APPDATA"):
+        data_dir = os.environ["APPDATA"]
+    else:
+        data_dir = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(data_dir, "pyside_lab_3", "metrics")
+
+
+def encode_header(channels):
+    names = "\n".join(channels).encode("utf-8")
+    header = HEADER.pack(MAGIC, VERSION, len(channels), len(names)) + names
+    return header + bytes(-len(header) % 8)
+
+
+def decode_header(data):
+    """(каналы, размер заголовка) сегмента."""
+    magic, version, count, length = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("не сегмент архива показателей")
+    end = HEADER.size + length
+    channels = data[HEADER.size:end].decode("utf-8").split("\n") if count else []
+    return channels, end + (-end % 8)
+
+
+class MetricsArchive:
+    """
+    Архив отсчётов в каталоге directory.
+
+    :param segment_bytes: размер сегмента, после которого начинается новый
+    :param segment_seconds: сколько секунд отсчётов пишется в один сегмент
+    :param max_bytes: предельный размер архива
+    :param max_age: сколько секунд хранятся отсчёты
+    """
+
+    def __init__(self, directory, segment_bytes=4 * 2 ** 20, segment_seconds=3600,
+                 max_bytes=256 * 2 ** 20, max_age=7 * 24 * 3600):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.file = None
+        self.channels = None
+        self.started = 0.0
+        os.makedirs(directory, exist_ok=True)
+
+    def segments(self):
+        """(начало, путь) сегментов от старых к новым."""
+        result = []
+        for name in os.listdir(self.directory):
+            if name.startswith(PREFIX) and name.endswith(SUFFIX):
+                try:
+                    result.append((int(name[len(PREFIX):-len(SUFFIX)]) / 1000, os.path.join(self.directory, name)))
+                except ValueError:
+                    pass
+        return sorted(result)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def _open_segment(self, channels, timestamp):
+        self.close()
+        start = int(timestamp * 1000)
+        path = os.path.join(self.directory, f"{PREFIX}{start}{SUFFIX}")
+        while os.path.exists(path):
+            start += 1
+            path = os.path.join(self.directory, f"{PREFIX}{start}{SUFFIX}")
+        self.file = open(path, "wb")
+        self.file.write(encode_header(channels))
+        self.channels = list(channels)
+        self.started = timestamp
+        self.prune(timestamp)
+
+    def append(self, batch):
+        """Отсчёты пачки collectors.SampleBatch в конец архива."""
+        if not len(batch):
+            return
+        first = batch.row(0)[0]
+        if (self.file is None or batch.channels != self.channels or self.file.tell() >= self.segment_bytes
+                or first - self.started >= self.segment_seconds):
+            self._open_segment(batch.channels, first)
+        self.file.write(batch.data.tobytes())
+        self.file.flush()
+
+    def prune(self, now=None):
+        """Удаление сегментов сверх max_bytes и старше max_age (кроме текущего)."""
+        now = time.time() if now is None else now
+        current = self.file.name if self.file is not None else None
+        segments = [(start, path, os.path.getsize(path)) for start, path in self.segments()]
+        total = sum(size for _, _, size in segments)
+        for k, (start, path, size) in enumerate(segments):
+            if path == current or k + 1 == len(segments):
+                break
+            # Конец сегмента - начало следующего
+            end = segments[k + 1][0]
+            if total <= self.max_bytes and now - end <= self.max_age:
+                break
+            os.remove(path)
+            total -= size
+
+    def load(self, since=None, channels=None):
+        """
+        Отсчёты архива не раньше since одной пачкой SampleBatch.
+
+        :param since: время (time.time()) начала; None - весь архив
+        :param channels: нужные каналы (None - каналы самого нового сегмента);
+                         в сегментах без какого-то из них строки пропускаются
+        """
+        segments = self.segments()
+        if since is not None:
+            # Сегмент нужен, если следующий за ним начинается позже since
+            segments = [segment for k, segment in enumerate(segments)
+                        if k + 1 == len(segments) or segments[k + 1][0] > since]
+        if channels is None:
+            channels = read_channels(segments[-1][1]) if segments else []
+        data = array('d')
+        for _, path in segments:
+            with open(path, "rb") as file:
+                size = os.fstat(file.fileno()).st_size
+                if size < HEADER.size:
+                    continue
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    try:
+                        names, offset = decode_header(mapped)
+                    except ValueError:
+                        continue
+                    width = len(names) + 1
+                    rows = (size - offset) // (8 * width)  # Недописанная при сбое строка отбрасывается
+                    values = memoryview(mapped)[offset:offset + rows * width * 8].cast('d')
+                    try:
+                        start = first_row(values, width, rows, since) if since is not None else 0
+                        if names == channels:
+                            data.frombytes(values[start * width:].cast('B'))
+                        elif all(channel in names for channel in channels):
+                            # Столбцы нужных каналов переставляются срезами с шагом, без цикла по строкам
+                            columns = [0] + [names.index(channel) + 1 for channel in channels]
+                            block = array('d', bytes(8 * (rows - start) * len(columns)))
+                            for j, c in enumerate(columns):
+                                block[j::len(columns)] = array('d', values[start * width + c::width])
+                            data.extend(block)
+                    finally:
+                        values.release()
+        return SampleBatch(channels, data, {}, {})
+
+
+def read_channels(path):
+    """Каналы сегмента (пустой список, если файл не сегмент архива)."""
+    with open(path, "rb") as file:
+        header = file.read(HEADER.size)
+        try:
+            _, _, _, length = HEADER.unpack(header)
+            return decode_header(header + file.read(length))[0]
+        except (struct.error, ValueError):
+            return []
+
+
+def first_row(values, width, rows, since):
+    """Номер первой строки со временем не раньше since (строки идут по времени)."""
+    lo, hi = 0, rows
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if values[mid * width] < since:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
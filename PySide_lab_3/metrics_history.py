@@ -0,0 +1,167 @@
+"""
+История показателей системы (загрузка CPU, RAM и т.п.) ограниченного размера.
+
+Отсчёты с метками времени хранятся в кольцевых буферах array('d')/array('f')
+заданной ёмкости: память выделяется один раз при создании и дальше не растёт.
+Кроме сырых отсчётов история держит несколько уровней прореживания: каждые
+factor записей уровня сворачиваются в одну запись следующего уровня (минимум,
+максимум, среднее). Для графика шириной width берётся самый подробный
+уровень, на котором за нужный промежуток не больше width * factor записей,
+поэтому отрисовка часов истории стоит столько же, сколько отрисовка минуты.
+"""
+import time
+from array import array
+
+
+class RingLevel:
+    """Один уровень истории: время и min/max/среднее каждого канала в кольцевых массивах."""
+
+    def __init__(self, capacity, channels):
+        self.capacity = capacity
+        self.times = array('d', bytes(8 * capacity))
+        self.mins = [array('f', bytes(4 * capacity)) for _ in range(channels)]
+        self.maxs = [array('f', bytes(4 * capacity)) for _ in range(channels)]
+        self.avgs = [array('f', bytes(4 * capacity)) for _ in range(channels)]
+        self.next = 0  # Позиция следующей записи
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, timestamp, mins, maxs, avgs):
+        k = self.next
+        self.times[k] = timestamp
+        for c in range(len(self.mins)):
+            self.mins[c][k] = mins[c]
+            self.maxs[c][k] = maxs[c]
+            self.avgs[c][k] = avgs[c]
+        self.next = (k + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def position(self, i):
+        """Позиция в массивах i-й записи, считая от самой старой."""
+        return (self.next - self.count + i) % self.capacity
+
+    def first_after(self, timestamp):
+        """Номер (от самой старой) первой записи не раньше timestamp."""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.times[self.position(mid)] < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def tail(self, values, start):
+        """Записи массива values уровня с номера start до самой новой."""
+        begin = self.position(start)
+        end = begin + self.count - start
+        if end <= self.capacity:
+            return values[begin:end]
+        return values[begin:] + values[:end - self.capacity]
+
+
+class MetricsHistory:
+    """
+    История отсчётов показателей с метками времени.
+
+    :param channels: имена показателей в порядке значений отсчёта
+    :param capacity: число записей на каждом уровне
+    :param factor: во сколько раз каждый следующий уровень реже предыдущего
+    :param levels: число уровней вместе с сырыми отсчётами
+    """
+
+    def __init__(self, channels=("cpu", "ram"), capacity=3600, factor=10, levels=3):
+        self.channels = tuple(channels)
+        self.factor = factor
+        self.levels = [RingLevel(capacity, len(self.channels)) for _ in range(levels)]
+        # Незаконченные записи уровней 1, 2, ...: [число записей, min, max, сумма средних]
+        self.pending = [self._empty_bucket() for _ in range(levels - 1)]
+
+    def _empty_bucket(self):
+        n = len(self.channels)
+        return [0, [float("inf")] * n, [float("-inf")] * n, [0.0] * n]
+
+    def __len__(self):
+        """Число сырых отсчётов в истории."""
+        return len(self.levels[0])
+
+    def append(self, values, timestamp=None):
+        """
+        Отсчёт: значения в порядке channels.
+
+        :param timestamp: время отсчёта в секундах (None - текущее time.time())
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        self.levels[0].append(timestamp, values, values, values)
+        mins = maxs = avgs = values
+        for k, bucket in enumerate(self.pending):
+            bucket[0] += 1
+            for c in range(len(self.channels)):
+                bucket[1][c] = min(bucket[1][c], mins[c])
+                bucket[2][c] = max(bucket[2][c], maxs[c])
+                bucket[3][c] += avgs[c]
+            if bucket[0] < self.factor:
+                break
+            mins, maxs, avgs = bucket[1], bucket[2], [total / self.factor for total in bucket[3]]
+            self.levels[k + 1].append(timestamp, mins, maxs, avgs)
+            self.pending[k] = self._empty_bucket()
+
+    def extend(self, batch):
+        """Все отсчёты пачки collectors.SampleBatch (берутся каналы этой истории)."""
+        columns = [batch.channels.index(channel) for channel in self.channels]
+        for timestamp, values in batch.rows():
+            self.append([values[c] for c in columns], timestamp)
+
+    def latest(self):
+        """Значения последнего отсчёта или None, если история пуста."""
+        level = self.levels[0]
+        if not level.count:
+            return None
+        k = level.position(level.count - 1)
+        return tuple(avgs[k] for avgs in level.avgs)
+
+    def _unfinished(self, depth, c):
+        """(min, max, среднее) отсчётов, ещё не попавших в уровень depth, или None."""
+        lo, hi, total, samples = float("inf"), float("-inf"), 0.0, 0
+        for k in range(depth):
+            count, mins, maxs, sums = self.pending[k]
+            if count:
+                weight = self.factor ** k
+                lo, hi = min(lo, mins[c]), max(hi, maxs[c])
+                total += sums[c] * weight
+                samples += count * weight
+        return (lo, hi, total / samples) if samples else None
+
+    def buckets(self, channel, width, span=None, now=None):
+        """
+        Не больше width корзин (min, max, среднее) показателя channel от старых к новым.
+
+        :param span: промежуток в секундах до now (None - вся история)
+        :param now: конец промежутка (None - время последнего отсчёта)
+        """
+        c = self.channels.index(channel)
+        raw = self.levels[0]
+        if not raw.count:
+            return []
+        if span is not None and now is None:
+            now = raw.times[raw.position(raw.count - 1)]
+        for depth, level in enumerate(self.levels):
+            start = level.first_after(now - span) if span is not None else 0
+            # Переполненный уровень уже потерял старые записи: нужен более редкий
+            covers = level.count < level.capacity or (span is not None and start > 0)
+            if covers and level.count - start <= width * self.factor or depth == len(self.levels) - 1:
+                break
+        mins, maxs, avgs = (list(level.tail(values[c], start)) for values in (level.mins, level.maxs, level.avgs))
+        # Отсчёты, которые ещё не свернулись в запись выбранного уровня
+        unfinished = self._unfinished(depth, c)
+        if unfinished:
+            mins.append(unfinished[0])
+            maxs.append(unfinished[1])
+            avgs.append(unfinished[2])
+        step = -(-len(avgs) // width)
+        return [(min(mins[i:i + step]), max(maxs[i:i + step]), sum(avgs[i:i + step]) / len(avgs[i:i + step]))
+                for i in range(0, len(avgs), step)]
@@ -0,0 +1,107 @@
+"""
+Общий на всё приложение сбор показателей системы.
+
+MetricsService держит один поток SystemInfo, сколько бы окон ни показывало
+загрузку системы. Каждый подписчик задаёт свой интервал: поток опрашивает
+систему с наименьшим из них, а подписчику с большим интервалом достаётся
+прореженный поток отсчётов (не больше одного за его интервал). Когда
+подписчиков не остаётся, поток останавливается и psutil не опрашивается.
+"""
+from PySide6.QtCore import QCoreApplication, QObject
+
+from a_threads import SystemInfo
+
+
+class Subscription:
+    """Подписка на отсчёты: callback получает collectors.SampleBatch."""
+
+    def __init__(self, service, callback, interval):
+        self.service = service
+        self.callback = callback
+        self.interval = interval
+        self.due = 0.0  # Время (time.time()), начиная с которого нужен следующий отсчёт
+
+    def setInterval(self, interval) -> None:
+        """Новый интервал подписчика, действует сразу."""
+        self.interval = interval
+        self.due = 0.0
+        self.service.update_delay()
+
+    def cancel(self) -> None:
+        self.service.unsubscribe(self)
+
+
+class MetricsService(QObject):
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        """Единственный экземпляр службы (создаётся при первом обращении)."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, collectors=None, parent=None):
+        """:param collectors: сборщики для SystemInfo (None - все из collectors.default_collectors())"""
+        super().__init__(parent)
+        self.collectors = collectors
+        self.subscriptions = []
+        self.thread = None
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def subscribe(self, callback, interval=1.0):
+        """
+        Подписка на отсчёты не чаще чем раз в interval секунд.
+
+        :return: Subscription (для смены интервала и отписки)
+        """
+        subscription = Subscription(self, callback, interval)
+        self.subscriptions.append(subscription)
+        if self.thread is None:
+            self.thread = SystemInfo(collectors=self.collectors)
+            self.thread.samplesReceived.connect(self.dispatch)
+            self.update_delay()
+            self.thread.start()
+        else:
+            self.update_delay()
+        return subscription
+
+    def unsubscribe(self, subscription) -> None:
+        if subscription in self.subscriptions:
+            self.subscriptions.remove(subscription)
+        if not self.subscriptions:
+            self.shutdown()
+        else:
+            self.update_delay()
+
+    def update_delay(self) -> None:
+        """Поток опрашивает систему с наименьшим интервалом подписчиков."""
+        if self.thread is not None and self.subscriptions:
+            self.thread.setDelay(min(subscription.interval for subscription in self.subscriptions))
+
+    def shutdown(self) -> None:
+        """Остановка потока; следующая подписка запустит новый."""
+        if self.thread is not None:
+            self.thread.samplesReceived.disconnect(self.dispatch)
+            self.thread.stop()
+            self.thread.deleteLater()
+            self.thread = None
+
+    def dispatch(self, batch) -> None:
+        """Раздача пачки отсчётов: каждому подписчику - отсчёты с его интервалом."""
+        if self.thread is None:
+            return
+        # Допуск на разброс времени отсчётов: отсчёт чуть раньше срока тоже подходит
+        tolerance = self.thread.delay / 2
+        for subscription in list(self.subscriptions):
+            rows = []
+            for i, (timestamp, _) in enumerate(batch.rows()):
+                if timestamp + tolerance >= subscription.due:
+                    rows.append(i)
+                    subscription.due = timestamp + subscription.interval
+            if len(rows) == len(batch):
+                subscription.callback(batch)
+            elif rows:
+                subscription.callback(batch.select(rows))
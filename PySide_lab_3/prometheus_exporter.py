@@ -0,0 +1,128 @@
+"""
+HTTP-точка /metrics с последними показателями SystemInfo в текстовом
+формате Prometheus (exposition format 0.0.4).
+
+Сервер http.server работает в своём потоке и по умолчанию слушает только
+127.0.0.1. update() лишь запоминает последнюю пачку отсчётов, текст
+собирается при запросе, поэтому частый опрос системы не тратит время на
+форматирование, которое никто не читает.
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Канал SystemInfo -> (метрика, метки)
+CHANNELS = {
+    "cpu": ("system_cpu_percent", {}),
+    "ram": ("system_memory_percent", {}),
+    "load1": ("system_load_average", {"period": "1m"}),
+    "load5": ("system_load_average", {"period": "5m"}),
+    "load15": ("system_load_average", {"period": "15m"}),
+    "disk_read": ("system_disk_bytes_per_second", {"direction": "read"}),
+    "disk_write": ("system_disk_bytes_per_second", {"direction": "write"}),
+    "net_recv": ("system_network_bytes_per_second", {"direction": "recv"}),
+    "net_sent": ("system_network_bytes_per_second", {"direction": "sent"}),
+}
+
+HELP = {
+    "system_cpu_percent": "Загрузка CPU, %",
+    "system_cpu_core_percent": "Загрузка логического ядра, %",
+    "system_memory_percent": "Использование RAM, %",
+    "system_load_average": "Средняя загрузка системы",
+    "system_disk_bytes_per_second": "Скорость чтения и записи дисков, байт/с",
+    "system_network_bytes_per_second": "Скорость приёма и передачи по сети, байт/с",
+    "system_process_cpu_percent": "Загрузка CPU процессом, %",
+    "system_process_resident_bytes": "Резидентная память процесса, байт",
+    "system_collector_cost_milliseconds": "Время работы сборщика за отсчёт, мс",
+    "system_sample_timestamp_seconds": "Время последнего отсчёта (Unix)",
+}
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def metric_name(channel):
+    """Метрика и метки для канала SystemInfo."""
+    if channel in CHANNELS:
+        return CHANNELS[channel]
+    if channel.startswith("cpu") and channel[3:].isdigit():
+        return "system_cpu_core_percent", {"core": channel[3:]}
+    return "system_" + "".join(ch if ch.isalnum() else "_" for ch in channel), {}
+
+
+def exposition(batch):
+    """Текст для Prometheus по последнему отсчёту пачки collectors.SampleBatch."""
+    families = {}
+
+    def add(name, labels, value):
+        families.setdefault(name, []).append((labels, value))
+
+    timestamp, values = batch.row(-1)
+    add("system_sample_timestamp_seconds", {}, timestamp)
+    for channel, value in zip(batch.channels, values):
+        # Места списка процессов выводятся ниже по details с именами процессов
+        if not channel.startswith("top"):
+            add(*metric_name(channel), value)
+    for pid, name, cpu, rss in batch.details.get("processes", []):
+        labels = {"pid": pid, "name": name}
+        add("system_process_cpu_percent", labels, cpu)
+        add("system_process_resident_bytes", labels, rss * 2 ** 20)
+    for collector, cost in batch.costs.items():
+        add("system_collector_cost_milliseconds", {"collector": collector}, cost)
+
+    lines = []
+    for name, samples in families.items():
+        lines.append(f"# HELP {name} {HELP.get(name, name)}")
+        lines.append(f"# TYPE {name} gauge")
+        for labels, value in samples:
+            label_text = ",".join(f'{key}="{escape(text)}"' for key, text in labels.items())
+            lines.append(f"{name}{{{label_text}}} {value!r}" if label_text else f"{name} {value!r}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        batch = self.server.exporter.batch
+        body = (exposition(batch) if batch is not None and len(batch) else "").encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class PrometheusExporter:
+    """
+    Сервер /metrics; update подходит как подписчик MetricsService.
+
+    :param port: порт (0 - любой свободный, см. атрибут port)
+    """
+
+    def __init__(self, host="127.0.0.1", port=9108):
+        self.batch = None
+        self.server = ThreadingHTTPServer((host, port), MetricsHandler)
+        self.server.daemon_threads = True
+        self.server.exporter = self
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, name="prometheus-exporter", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def update(self, batch):
+        """Последняя пачка отсчётов (замена ссылки атомарна, блокировка не нужна)."""
+        self.batch = batch
+
+    def close(self):
+        if self.thread.is_alive():
+            self.server.shutdown()
+        self.server.server_close()
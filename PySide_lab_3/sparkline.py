@@ -0,0 +1,51 @@
+"""
+Виджет-спарклайн: график одного показателя MetricsHistory на QPainter.
+
+Каждая корзина истории - столбец от минимума до максимума (светлая полоса)
+и точка линии средних значений. Корзин не больше, чем пикселей по ширине
+виджета, поэтому время отрисовки не зависит от длины истории.
+"""
+from PySide6.QtCore import QPointF
+from PySide6.QtGui import QColor, QPainter, QPen, QPolygonF
+from PySide6.QtWidgets import QWidget
+
+
+class Sparkline(QWidget):
+    def __init__(self, history, channel, span=None, maximum=100.0, color="#2a82da", parent=None):
+        """
+        :param history: MetricsHistory
+        :param channel: имя показателя в history
+        :param span: промежуток истории в секундах (None - вся история)
+        :param maximum: значение у верхнего края графика
+        """
+        super().__init__(parent)
+        self.history = history
+        self.channel = channel
+        self.span = span
+        self.maximum = maximum
+        self.color = QColor(color)
+        self.setMinimumHeight(40)
+
+    def paintEvent(self, event) -> None:
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.palette().base())
+        buckets = self.history.buckets(self.channel, max(1, self.width()), self.span)
+        if not buckets:
+            return
+        bottom = self.height() - 1
+        scale = bottom / self.maximum
+        step = self.width() / len(buckets)
+
+        # Разброс значений в корзине
+        band = QColor(self.color)
+        band.setAlpha(70)
+        painter.setPen(QPen(band, max(1.0, step)))
+        for k, (low, high, _) in enumerate(buckets):
+            x = (k + 0.5) * step
+            painter.drawLine(QPointF(x, bottom - low * scale), QPointF(x, bottom - high * scale))
+
+        # Средние значения
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QPen(self.color, 1.5))
+        painter.drawPolyline(QPolygonF([QPointF((k + 0.5) * step, bottom - avg * scale)
+                                        for k, (_, _, avg) in enumerate(buckets)]))
@@ -0,0 +1,124 @@
+"""
+Как растёт стоимость хода, can_move и отрисовки с размером поля N x N.
+
+Отрисовка меряется синхронным repaint() виджета GameView для двух вариантов:
+N * N виджетов Tile и один BoardCanvas, а также кадр анимации хода на BoardCanvas
+(середина сдвига и середина "пульса"). Запуск из корня репозитория:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_board_sizes
+"""
+import os
+import sys
+import tempfile
+import time
+
+from PySide6.QtWidgets import QApplication
+
+from benchmarks.boards import random_boards
+from exam.exam_game_2048 import BoardCanvas, GameView
+from exam.game_logic_2048 import DIRECTIONS, GameLogic, move_transitions
+
+SIZES = (3, 4, 5, 6, 8, 10, 12, 16)
+BOARDS = 50
+REPEAT = 5
+FRAME_MS = 1000 / 60
+
+
+def blocked_board(n):
+    """Заполненное поле без соседних равных плиток - худший случай для can_move."""
+    return [[2 if (i + j) % 2 else 4 for j in range(n)] for i in range(n)]
+
+
+def per_call(func, calls):
+    """Лучшее из REPEAT повторений время одного вызова."""
+    best = float("inf")
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best / calls
+
+
+def bench_logic(n):
+    logic = GameLogic(size=n)
+    boards = random_boards(n, BOARDS)
+
+    def moves():
+        for k, board in enumerate(boards):
+            # В обход сеттера board: полный пересчёт признаков поля не входит в стоимость хода
+            logic._board = [row[:] for row in board]
+            logic.move(DIRECTIONS[k % 4])
+
+    blocked = blocked_board(n)
+
+    def can_moves():
+        logic.board = blocked
+        for _ in range(BOARDS):
+            logic.can_move()
+
+    return per_call(moves, BOARDS), per_call(can_moves, BOARDS)
+
+
+def bench_render(n, canvas, scores_path):
+    logic = GameLogic(size=n)
+    view = GameView(logic, canvas, scores_path=scores_path)
+    view.show()
+    QApplication.processEvents()
+    boards = random_boards(n, BOARDS)
+
+    def renders():
+        for board in boards:
+            logic.board = board
+            view.update_view()
+            view.repaint()
+
+    result = per_call(renders, BOARDS)
+    view.close()
+    view.deleteLater()
+    return result
+
+
+def bench_animation(n, scores_path):
+    logic = GameLogic(size=n)
+    view = GameView(logic, canvas=True, scores_path=scores_path)
+    view.show()
+    QApplication.processEvents()
+    boards = random_boards(n, BOARDS)
+    canvas = view.canvas
+
+    def frames():
+        for k, board in enumerate(boards):
+            canvas.board = board
+            canvas.animate(move_transitions(board, DIRECTIONS[k % 4]), None)
+            # Кадр сдвига и кадр "пульса"
+            canvas.animation.setCurrentTime(int(BoardCanvas.ANIMATION_MS * 0.3))
+            canvas.repaint()
+            canvas.animation.setCurrentTime(int(BoardCanvas.ANIMATION_MS * 0.8))
+            canvas.repaint()
+        canvas.finish_animation()
+
+    result = per_call(frames, 2 * BOARDS)
+    view.close()
+    view.deleteLater()
+    return result
+
+
+def main():
+    app = QApplication.instance() or QApplication(sys.argv)
+    # Своя база результатов: замер не трогает базу игрока и best_scores.json в текущем каталоге
+    scores_dir = tempfile.TemporaryDirectory()
+    scores_path = os.path.join(scores_dir.name, "scores.sqlite3")
+    print(f"{'N':>3} {'ход, мкс':>10} {'can_move, мкс':>14} {'Tile, мс':>10} {'Canvas, мс':>11} {'анимация, мс':>13}")
+    for n in SIZES:
+        move_cost, can_move_cost = bench_logic(n)
+        tiles_cost = bench_render(n, False, scores_path)
+        canvas_cost = bench_render(n, True, scores_path)
+        animation_cost = bench_animation(n, scores_path)
+        frame = "" if max(tiles_cost, canvas_cost, animation_cost) * 1000 < FRAME_MS else "  > кадра 60 Гц"
+        print(f"{n:>3} {move_cost * 1e6:>10.1f} {can_move_cost * 1e6:>14.1f} "
+              f"{tiles_cost * 1e3:>10.2f} {canvas_cost * 1e3:>11.2f} {animation_cost * 1e3:>13.2f}{frame}")
+    app.processEvents()
+    scores_dir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Память на одно состояние истории отмены: History против списка копий поля.
+
+Память меряется tracemalloc, время перехода - лучшее из REPEAT повторений.
+Запуск из корня репозитория:
+    python -m benchmarks.bench_history
+"""
+import random
+import time
+import tracemalloc
+
+from exam.game_logic_2048 import DIRECTIONS, GameLogic
+from exam.history_2048 import History
+from exam.rng_2048 import SplitMix64
+
+SIZES = (4, 8, 16)
+STEPS = 10000
+REPEAT = 5
+
+
+def game_states(n, steps, seed=2048):
+    """Состояния случайной партии; закончившаяся партия начинается заново."""
+    rnd = random.Random(seed)
+    logic = GameLogic(SplitMix64(seed), size=n)
+    states = []
+    while len(states) < steps:
+        if not logic.can_move() or not states:
+            logic.reset()
+            logic.place_new_tile()
+            logic.place_new_tile()
+        elif logic.move(rnd.choice(DIRECTIONS)):
+            logic.place_new_tile()
+        else:
+            continue
+        states.append(([row[:] for row in logic.board], logic.score))
+    return states
+
+
+def traced(build):
+    """Объект, который строит build, и занятая им память в байтах."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, used
+
+
+def per_call(func, calls):
+    best = float("inf")
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best / calls
+
+
+def main():
+    print(f"{'N':>3} {'History, Б/ход':>15} {'копии, Б/ход':>13} {'переход, мкс':>13}")
+    for n in SIZES:
+        states = game_states(n, STEPS)
+
+        def build_history():
+            history = History(n)
+            for board, score in states:
+                history.push(board, score)
+            return history
+
+        def build_copies():
+            return [([row[:] for row in board], score) for board, score in states]
+
+        history, history_bytes = traced(build_history)
+        _, copies_bytes = traced(build_copies)
+        indexes = random.Random(n).sample(range(STEPS), 1000)
+
+        def jumps():
+            for index in indexes:
+                history.jump(index)
+
+        jump_cost = per_call(jumps, len(indexes))
+        print(f"{n:>3} {history_bytes / STEPS:>15.1f} {copies_bytes / STEPS:>13.1f} {jump_cost * 1e6:>13.2f}")
+
+
+if __name__ == '__main__':
+    main()
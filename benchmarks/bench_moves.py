@@ -0,0 +1,175 @@
+"""
+Замер скорости хода для разных реализаций логики 2048.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_moves
+"""
+import timeit
+
+from benchmarks.boards import random_boards
+from exam.bitboard_2048 import BitboardLogic
+from exam.game_logic_2048 import DIRECTIONS, GameLogic
+from exam.row_tables_2048 import ROW_MASK, get_tables, move_row_left
+
+BOARDS = 1000
+REPEAT = 5
+# Цель: ход движка по умолчанию для 4x4 хотя бы в 10 раз быстрее исходного GameLogic
+TARGET = 10
+# Повороты поля до и после move_left в исходном GameView.on_move
+ROTATIONS = {'left': (0, 0), 'right': (2, 2), 'up': (3, 1), 'down': (1, 3)}
+
+
+def loop_merge_row(row):
+    """Исходный GameLogic.merge_row для одной строки."""
+    temp = [val for val in row if val is not None]
+    result = []
+    score = 0
+    k = 0
+    while k < len(temp):
+        if k + 1 < len(temp) and temp[k] == temp[k + 1]:
+            result.append(temp[k] * 2)
+            score += temp[k] * 2
+            k += 2
+        else:
+            result.append(temp[k])
+            k += 1
+    return result + [None] * (len(row) - len(result)), score
+
+
+def loop_move_left(board):
+    """Исходный алгоритм GameLogic.merge_row (цикл по каждой строке) - точка отсчёта."""
+    score = 0
+    for i in range(4):
+        temp = [val for val in board[i] if val is not None]
+        result = []
+        k = 0
+        while k < len(temp):
+            if k + 1 < len(temp) and temp[k] == temp[k + 1]:
+                result.append(temp[k] * 2)
+                score += temp[k] * 2
+                k += 2
+            else:
+                result.append(temp[k])
+                k += 1
+        board[i] = result + [None] * (4 - len(result))
+    return score
+
+
+def rotate(board):
+    """Исходный GameLogic.rotate: новое поле, повёрнутое по часовой стрелке."""
+    n = len(board)
+    rotated = [[None] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(n):
+            rotated[j][n - 1 - i] = board[i][j]
+    return rotated
+
+
+def reference_move(board, direction):
+    """Исходный ход в любую сторону: повороты всего поля вокруг move_left."""
+    before, after = ROTATIONS[direction]
+    for _ in range(before):
+        board = rotate(board)
+    score = loop_move_left(board)
+    for _ in range(after):
+        board = rotate(board)
+    return board, score
+
+
+def to_bits(board):
+    bits = 0
+    for i in range(4):
+        for j in range(4):
+            if board[i][j]:
+                bits |= (board[i][j].bit_length() - 1) << (4 * (4 * i + j))
+    return bits
+
+
+def bench(name, func, baseline=None, count=BOARDS, unit="ход"):
+    best = min(timeit.repeat(func, number=1, repeat=REPEAT)) / count
+    line = f"{name:<40} {best * 1e6:8.3f} мкс/{unit}"
+    if baseline:
+        line += f"   x{baseline / best:.1f}"
+    print(line)
+    return best
+
+
+def main():
+    boards = random_boards(4, BOARDS)
+    bit_boards = [to_bits(board) for board in boards]
+    rows = [row for board in boards for row in board]
+    get_tables()  # построение/загрузка таблиц не входит в замер
+
+    def reference_merge_rows():
+        for row in rows:
+            loop_merge_row(row)
+
+    def reference_move_left():
+        for board in boards:
+            loop_move_left([row[:] for row in board])
+
+    logic = GameLogic()
+
+    def list_merge_rows():
+        for row in rows:
+            logic.merge_row(row)
+
+    def list_move_left():
+        for board in boards:
+            # Поле ставится в обход сеттера board: его полный пересчёт замеряется отдельно
+            logic._board = [row[:] for row in board]
+            logic.move_left()
+
+    def list_set_board():
+        for board in boards:
+            logic.board = [row[:] for row in board]
+
+    def bitboard_loop_move_left():
+        for bits in bit_boards:
+            new_bits = 0
+            for shift in (0, 16, 32, 48):
+                new_row, _ = move_row_left((bits >> shift) & ROW_MASK)
+                new_bits |= new_row << shift
+
+    bit_logic = BitboardLogic()
+
+    def bitboard_table_move_left():
+        for bits in bit_boards:
+            bit_logic.bits = bits
+            bit_logic.move_left()
+
+    # Ходы по очереди во все четыре стороны
+    def reference_moves():
+        for k, board in enumerate(boards):
+            reference_move([row[:] for row in board], DIRECTIONS[k % 4])
+
+    def list_moves():
+        for k, board in enumerate(boards):
+            logic._board = [row[:] for row in board]
+            logic.move(DIRECTIONS[k % 4])
+
+    def bitboard_moves():
+        for k, bits in enumerate(bit_boards):
+            bit_logic.bits = bits
+            bit_logic.move(DIRECTIONS[k % 4])
+
+    row_baseline = bench("Исходный цикл merge_row", reference_merge_rows, count=len(rows), unit="строку")
+    bench("GameLogic.merge_row (запомненные)", list_merge_rows, row_baseline, count=len(rows), unit="строку")
+    print()
+
+    baseline = bench("Исходный цикл, ход влево", reference_move_left)
+    bench("GameLogic.move_left", list_move_left, baseline)
+    bench("GameLogic.board = (пересчёт признаков)", list_set_board, baseline)
+    bench("BitboardLogic, цикл по строке", bitboard_loop_move_left, baseline)
+    bench("BitboardLogic.move_left (таблицы)", bitboard_table_move_left, baseline)
+    print()
+
+    baseline = bench("Исходный GameLogic, все стороны", reference_moves)
+    bench("GameLogic.move", list_moves, baseline)
+    best = bench("BitboardLogic.move (4x4 по умолчанию)", bitboard_moves, baseline)
+    speedup = baseline / best
+    print(f"Цель x{TARGET} для движка по умолчанию: {'достигнута' if speedup >= TARGET else 'НЕ достигнута'} "
+          f"(x{speedup:.1f})")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Холодный запуск игры 2048 до первой отрисовки поля.
+
+Каждый замер - отдельный процесс python -X importtime, который импортирует
+exam_game_2048, создаёт MainWindow и завершается после первого события
+Paint плитки или BoardCanvas. Выводятся медианы: время процесса целиком,
+время импорта модуля игры, время до первой отрисовки от начала скрипта,
+а также какие из DEFERRED уже загружены к первой отрисовке (sqlite3 может
+успеть загрузить фоновый поток записи результатов) и сколько модулей
+импортирует консольная логика (без Qt).
+Запуск из корня репозитория:
+    python -m benchmarks.bench_startup
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 9
+# Модули, которые не нужны для первой отрисовки
+DEFERRED = ("json", "sqlite3", "exam.expectimax_2048", "exam.score_store_2048")
+
+CHILD = """
+import time
+started = time.perf_counter()
+import sys
+sys.path.insert(0, {root!r})
+from exam import exam_game_2048 as game
+imported = time.perf_counter()
+from PySide6.QtCore import QEvent, QObject, QTimer
+from PySide6.QtWidgets import QApplication
+
+
+class FirstPaint(QObject):
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint and isinstance(watched, (game.Tile, game.BoardCanvas)):
+            painted = time.perf_counter()
+            print(f"STARTUP {{(imported - started) * 1000:.1f}} {{(painted - started) * 1000:.1f}}")
+            print("LOADED " + " ".join(name for name in {deferred!r} if name in sys.modules))
+            app.removeEventFilter(self)
+            QTimer.singleShot(0, app.quit)
+        return False
+
+
+app = QApplication(sys.argv[:1])
+first_paint = FirstPaint()
+app.installEventFilter(first_paint)
+window = game.MainWindow(canvas={canvas})
+window.show()
+app.exec()
+window.close()
+"""
+
+
+def run_once(canvas, data_dir):
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"), XDG_DATA_HOME=data_dir)
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", CHILD.format(root=ROOT, canvas=canvas, deferred=DEFERRED)],
+                            capture_output=True, text=True, env=env, cwd=data_dir, check=True)
+    wall = time.perf_counter() - started
+    line = next(line for line in result.stdout.splitlines() if line.startswith("STARTUP"))
+    import_ms, paint_ms = map(float, line.split()[1:])
+    loaded = next(line for line in result.stdout.splitlines() if line.startswith("LOADED")).split()[1:]
+    modules = [line.rsplit("|", 1)[1].strip() for line in result.stderr.splitlines() if line.startswith("import time:")]
+    return wall * 1000, import_ms, paint_ms, modules, loaded
+
+
+def headless_modules():
+    """Модули, которые загружает импорт логики игры без графического интерфейса."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import exam.game_logic_2048, exam.selfplay"],
+                            capture_output=True, text=True, cwd=ROOT, check=True)
+    return [line.rsplit("|", 1)[1].strip() for line in result.stderr.splitlines() if line.startswith("import time:")]
+
+
+def main():
+    import tempfile
+    with tempfile.TemporaryDirectory() as data_dir:
+        print(f"{'поле':>7} {'процесс, мс':>12} {'импорт, мс':>11} {'до отрисовки, мс':>17} {'модулей':>8}")
+        for canvas in (False, True):
+            runs = [run_once(canvas, data_dir) for _ in range(RUNS)]
+            wall, import_ms, paint_ms = (statistics.median(values) for values in list(zip(*runs))[:3])
+            modules, loaded = runs[-1][3:]
+            name = "Canvas" if canvas else "Tile"
+            print(f"{name:>7} {wall:>12.0f} {import_ms:>11.0f} {paint_ms:>17.0f} {len(modules):>8}")
+        print("Загружено к первой отрисовке: " + (", ".join(loaded) or "ничего"))
+    headless = headless_modules()
+    qt = [name for name in headless if name.startswith("PySide6")]
+    print(f"Логика без GUI: {len(headless)} модулей, из них Qt: {len(qt)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,11 @@
+"""
+Случайные поля для замеров (одни и те же при одном зерне).
+"""
+import random
+
+BOARD_VALUES = [None, None, 2, 4, 8, 16, 32, 64, 128, 256]
+
+
+def random_boards(n, count, seed=2048):
+    rnd = random.Random(seed)
+    return [[[rnd.choice(BOARD_VALUES) for _ in range(n)] for _ in range(n)] for _ in range(count)]
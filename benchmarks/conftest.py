@@ -0,0 +1,25 @@
+"""
+Общие настройки замеров pytest-benchmark.
+
+Qt запускается без экрана (платформа offscreen), если не задана другая.
+Без установленного pytest-benchmark файлы test_*.py не собираются.
+"""
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Запуск из любого каталога: пакет exam лежит в корне репозитория
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import pytest_benchmark  # noqa: F401
+except ImportError:
+    collect_ignore_glob = ["test_*.py"]
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication(sys.argv[:1])
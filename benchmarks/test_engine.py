@@ -0,0 +1,107 @@
+"""
+Замеры логики 2048 (GameLogic) без Qt.
+
+Каждый замер обрабатывает пачку из BOARDS полей или строк, чтобы время
+вызова было заметно больше накладных расходов pytest-benchmark.
+"""
+import pytest
+
+from benchmarks.boards import random_boards
+from exam.game_logic_2048 import DIRECTIONS, GameLogic
+from exam.rng_2048 import SplitMix64
+
+BOARDS = 100
+
+
+@pytest.mark.parametrize("length", [4, 8], ids=["row4", "row8"])
+def test_merge_row(benchmark, length):
+    logic = GameLogic(size=length)
+    rows = [row for board in random_boards(length, BOARDS // length) for row in board]
+
+    def merge_rows():
+        for row in rows:
+            logic.merge_row(row)
+
+    benchmark(merge_rows)
+
+
+@pytest.mark.parametrize("size", [4, 8])
+def test_move_left(benchmark, size):
+    """Ход влево, включая присваивание поля (пересчёт маски пустых клеток)."""
+    logic = GameLogic(size=size)
+    boards = random_boards(size, BOARDS)
+
+    def moves():
+        for board in boards:
+            logic.board = [row[:] for row in board]
+            logic.move_left()
+
+    benchmark(moves)
+
+
+@pytest.mark.parametrize("size", [4, 8])
+def test_move_all_directions(benchmark, size):
+    logic = GameLogic(size=size)
+    boards = random_boards(size, BOARDS)
+
+    def moves():
+        for k, board in enumerate(boards):
+            logic.board = [row[:] for row in board]
+            logic.move(DIRECTIONS[k % 4])
+
+    benchmark(moves)
+
+
+def test_rotate(benchmark):
+    logic = GameLogic()
+    logic.board = random_boards(4, 1)[0]
+
+    def rotations():
+        for _ in range(BOARDS):
+            logic.rotate()
+
+    benchmark(rotations)
+
+
+@pytest.mark.parametrize("size", [4, 8])
+def test_can_move_blocked(benchmark, size):
+    """Худший случай: поле заполнено, соседних равных плиток нет."""
+    logic = GameLogic(size=size)
+    logic.board = [[2 if (i + j) % 2 else 4 for j in range(size)] for i in range(size)]
+
+    def checks():
+        for _ in range(BOARDS):
+            logic.can_move()
+
+    benchmark(checks)
+
+
+def test_place_new_tile(benchmark):
+    logic = GameLogic(rng=SplitMix64(1))
+    boards = random_boards(4, BOARDS)
+
+    def spawns():
+        for board in boards:
+            logic.board = [row[:] for row in board]
+            logic.place_new_tile()
+
+    benchmark(spawns)
+
+
+def play_random_game(seed):
+    logic = GameLogic(rng=SplitMix64(seed))
+    moves_rng = SplitMix64(~seed)
+    logic.place_new_tile()
+    logic.place_new_tile()
+    moves = 0
+    while logic.can_move():
+        if logic.move(moves_rng.choice(DIRECTIONS)):
+            logic.place_new_tile()
+            moves += 1
+    return moves
+
+
+def test_random_game(benchmark):
+    """Партия случайными ходами до конца (одна и та же для всех версий)."""
+    moves = benchmark(play_random_game, 7)
+    benchmark.extra_info["moves"] = moves
@@ -0,0 +1,48 @@
+"""
+Замеры отрисовки GameView на платформе Qt offscreen.
+
+update_view меряется отдельно (обновление плиток без отрисовки) и вместе
+с синхронным repaint().
+"""
+import pytest
+
+from benchmarks.boards import random_boards
+from exam.game_logic_2048 import GameLogic
+
+BOARDS = 20
+
+
+@pytest.fixture(params=[False, True], ids=["tiles", "canvas"])
+def view(request, qapp, tmp_path):
+    from exam.exam_game_2048 import GameView
+    view = GameView(GameLogic(), canvas=request.param, scores_path=str(tmp_path / "scores.sqlite3"),
+                    animate=False)
+    view.show()
+    qapp.processEvents()
+    yield view
+    view.close()
+    view.deleteLater()
+    qapp.processEvents()
+
+
+def test_update_view(benchmark, view):
+    boards = random_boards(view.logic.size, BOARDS)
+
+    def updates():
+        for board in boards:
+            view.logic.board = board
+            view.update_view()
+
+    benchmark(updates)
+
+
+def test_update_view_repaint(benchmark, view):
+    boards = random_boards(view.logic.size, BOARDS)
+
+    def renders():
+        for board in boards:
+            view.logic.board = board
+            view.update_view()
+            view.repaint()
+
+    benchmark(renders)
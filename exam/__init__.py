@@ -0,0 +1,3 @@
+"""
+Игра 2048: логика игры (без зависимости от Qt) и графический интерфейс на PySide6
+"""
@@ -0,0 +1,135 @@
+"""
+Пакетная симуляция тысяч партий 2048 на NumPy.
+
+Все поля хранятся в одном массиве (N, 4, 4) показателей степени (uint8,
+0 - пустая клетка). Ход применяется ко всем полям сразу: строки кодируются
+16-битными ключами и пропускаются через таблицы row_tables_2048,
+новые плитки расставляются векторно.
+
+У каждого поля свой поток SplitMix64, поэтому поле k ведёт себя так же, как
+GameLogic(rng=SplitMix64(seeds[k]), four_probability=p) при той же
+последовательности ходов.
+Ограничение: как и в BitboardLogic, две плитки 32768 не объединяются.
+
+Модуль требует numpy.
+"""
+import numpy as np
+
+from .game_logic_2048 import DIRECTIONS
+from .rng_2048 import GOLDEN_GAMMA, MIX1, MIX2
+from .row_tables_2048 import MAX_EXPONENT, SIZE, get_tables
+
+_GOLDEN_GAMMA = np.uint64(GOLDEN_GAMMA)
+_MIX1 = np.uint64(MIX1)
+_MIX2 = np.uint64(MIX2)
+_SHIFTS = np.array([0, 4, 8, 12], dtype=np.uint32)
+
+
+class BatchGameLogic:
+    """Набор из N независимых партий, которые ходят одновременно."""
+
+    def __init__(self, seeds, four_probability=0.0):
+        seeds = np.asarray(seeds, dtype=np.uint64)
+        self.four_probability = four_probability
+        self.count = len(seeds)
+        self.cells = np.zeros((self.count, SIZE, SIZE), dtype=np.uint8)
+        self.score = np.zeros(self.count, dtype=np.int64)
+        self.rng_state = seeds.copy()
+        left, _, score_left, _ = get_tables()
+        # Таблицы из array('H') / array('I') без копирования; ход вправо/вверх/вниз
+        # сводится к ходу влево через представление массива (см. _oriented)
+        self._row_left = np.frombuffer(left, dtype=np.uint16)
+        self._score_left = np.frombuffer(score_left, dtype=np.uint32)
+
+    def reset(self):
+        """Новые партии: пустые поля и по две начальные плитки, как в MainWindow."""
+        self.cells[:] = 0
+        self.score[:] = 0
+        everyone = np.ones(self.count, dtype=bool)
+        self.place_new_tiles(everyone)
+        self.place_new_tiles(everyone)
+
+    def board(self, k):
+        """Поле партии k в виде списка списков None/int, как GameLogic.board."""
+        return [[1 << int(e) if e else None for e in row] for row in self.cells[k]]
+
+    def max_tile(self):
+        return np.left_shift(1, self.cells.max(axis=(1, 2)).astype(np.int64))
+
+    def _oriented(self, direction):
+        """Вид на массив полей, в котором ход direction превращается в ход влево."""
+        if direction == 'left':
+            return self.cells
+        if direction == 'right':
+            return self.cells[:, :, ::-1]
+        if direction == 'up':
+            return self.cells.transpose(0, 2, 1)
+        if direction == 'down':
+            return self.cells.transpose(0, 2, 1)[:, :, ::-1]
+        raise ValueError(f"Неизвестное направление хода: {direction}")
+
+    def move(self, direction, mask=None):
+        """
+        Ход direction для всех полей (или только для полей из маски mask).
+
+        :return: булев массив (N,) - изменилось ли поле
+        """
+        view = self._oriented(direction)
+        keys = (view.astype(np.uint32) << _SHIFTS).sum(axis=2, dtype=np.uint32)
+        new_keys = self._row_left[keys]
+        gained = self._score_left[keys].sum(axis=1, dtype=np.int64)
+        new_view = ((new_keys[:, :, None] >> _SHIFTS) & 0xF).astype(np.uint8)
+        changed = (new_keys != keys).any(axis=1)
+        if mask is not None:
+            changed &= mask
+        # view - представление self.cells, присваивание записывает результат в исходный массив
+        view[changed] = new_view[changed]
+        self.score += np.where(changed, gained, 0)
+        return changed
+
+    def _next_u64(self, idx):
+        """Следующее значение SplitMix64 для полей с индексами idx."""
+        state = self.rng_state[idx] + _GOLDEN_GAMMA
+        self.rng_state[idx] = state
+        z = (state ^ (state >> np.uint64(30))) * _MIX1
+        z = (z ^ (z >> np.uint64(27))) * _MIX2
+        return z ^ (z >> np.uint64(31))
+
+    def place_new_tiles(self, mask):
+        """
+        Новая плитка на случайной пустой клетке каждого поля из маски.
+
+        Пустые клетки перебираются построчно, как в GameLogic.place_new_tile,
+        генератор продвигается только у полей, где есть куда ставить плитку.
+        При four_probability > 0 второе число потока выбирает плитку 4 или 2.
+        """
+        flat = self.cells.reshape(self.count, SIZE * SIZE)
+        empty = flat == 0
+        counts = empty.sum(axis=1)
+        idx = np.nonzero(mask & (counts > 0))[0]
+        if not len(idx):
+            return
+        draws = self._next_u64(idx)
+        k = ((draws >> np.uint64(32)) * counts[idx].astype(np.uint64)) >> np.uint64(32)
+        # Позиция k-й пустой клетки: первый индекс, где накопленное число пустых превышает k
+        position = np.argmax(np.cumsum(empty[idx], axis=1) > k[:, None].astype(np.int64), axis=1)
+        exponent = 1
+        if self.four_probability:
+            # То же преобразование в [0, 1), что SplitMix64.random
+            uniform = (self._next_u64(idx) >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+            exponent = np.where(uniform < self.four_probability, 2, 1).astype(np.uint8)
+        flat[idx, position] = exponent
+
+    def step(self, direction, mask=None):
+        """Ход и появление новой плитки на изменившихся полях."""
+        changed = self.move(direction, mask)
+        self.place_new_tiles(changed)
+        return changed
+
+    def game_over(self):
+        """Булев массив (N,): у поля нет ни одного возможного хода."""
+        cells = self.cells
+        has_empty = (cells == 0).any(axis=(1, 2))
+        row_pairs = ((cells[:, :, 1:] == cells[:, :, :-1]) & (cells[:, :, 1:] < MAX_EXPONENT)).any(axis=(1, 2))
+        col_pairs = ((cells[:, 1:, :] == cells[:, :-1, :]) & (cells[:, 1:, :] < MAX_EXPONENT)).any(axis=(1, 2))
+        return ~(has_empty | row_pairs | col_pairs)
@@ -0,0 +1,176 @@
+"""
+Битовое представление поля 2048.
+
+Всё поле 4x4 упаковано в одно 64-битное целое: на каждую клетку приходится
+4 бита, в которых хранится показатель степени двойки (0 - пустая клетка).
+Клетка (i, j) занимает биты 4 * (4 * i + j) ... 4 * (4 * i + j) + 3,
+т.е. строка i - это 16 бит со сдвигом 16 * i, а левая клетка строки - младшие 4 бита.
+"""
+from .rng_2048 import as_rng
+from .row_tables_2048 import CELL_MASK, MAX_EXPONENT, ROW_MASK, SIZE, VALUES, get_tables
+
+_LIST_TABLES = None
+
+
+def list_tables():
+    """
+    Таблицы для BitboardLogic.move в виде списков (элемент списка берётся быстрее,
+    чем элемент array): get_tables() и результаты хода строки вверх/вниз, уже
+    разложенные в столбец 0 поля, - вертикальный ход не транспонирует поле обратно.
+    """
+    global _LIST_TABLES
+    if _LIST_TABLES is None:
+        row_left, row_right, score_left, score_right = (list(table) for table in get_tables())
+        # Строка r = a | b << 4 | c << 8 | d << 12, разложенная в столбец: a | b << 16 | c << 32 | d << 48
+        spread = [a | b << 16 | c << 32 | d << 48
+                  for d in range(16) for c in range(16) for b in range(16) for a in range(16)]
+        column_up = [spread[row] for row in row_left]
+        column_down = [spread[row] for row in row_right]
+        _LIST_TABLES = row_left, row_right, score_left, score_right, column_up, column_down
+    return _LIST_TABLES
+
+
+def transpose(bits):
+    """Транспонирование поля 4x4: клетка (i, j) переходит в (j, i)."""
+    a1 = bits & 0xF0F00F0FF0F00F0F
+    a2 = bits & 0x0000F0F00000F0F0
+    a3 = bits & 0x0F0F00000F0F0000
+    a = a1 | (a2 << 12) | (a3 >> 12)
+    b1 = a & 0xFF00FF0000FF00FF
+    b2 = a & 0x00FF00FF00000000
+    b3 = a & 0x00000000FF00FF00
+    return b1 | (b2 >> 24) | (b3 << 24)
+
+
+def apply_rows(bits, table, score):
+    """Применение табличного хода к каждой строке поля: (новое поле, прирост счёта)."""
+    r0, r1, r2, r3 = bits & ROW_MASK, (bits >> 16) & ROW_MASK, (bits >> 32) & ROW_MASK, bits >> 48
+    return (table[r0] | table[r1] << 16 | table[r2] << 32 | table[r3] << 48,
+            score[r0] + score[r1] + score[r2] + score[r3])
+
+
+def board_to_bits(board):
+    """Упаковка поля 4x4 из списка списков None/int в 64-битное целое."""
+    bits = 0
+    for i in range(SIZE):
+        for j in range(SIZE):
+            if board[i][j]:
+                bits |= min(board[i][j].bit_length() - 1, MAX_EXPONENT) << (4 * (SIZE * i + j))
+    return bits
+
+
+class BitboardLogic:
+    """
+    Логика игры на битовом поле.
+
+    Повторяет интерфейс GameLogic (board, score, reset, place_new_tile,
+    place_tile, move, move_left, rotate, can_move), поэтому GameView работает с ней без изменений.
+    """
+
+    size = SIZE  # Битовое поле бывает только 4x4
+
+    def __init__(self, rng=None, four_probability=0.0):
+        self.bits = 0
+        self.score = 0
+        self.rng = as_rng(rng)
+        self.four_probability = four_probability
+        (self._row_left, self._row_right, self._score_left, self._score_right,
+         self._column_up, self._column_down) = list_tables()
+
+    def reset(self):
+        self.bits = 0
+        self.score = 0
+
+    @property
+    def board(self):
+        """Поле в виде списка списков None/int, как в GameLogic."""
+        bits = self.bits
+        return [[VALUES[(bits >> (16 * i + 4 * j)) & CELL_MASK] for j in range(SIZE)] for i in range(SIZE)]
+
+    @board.setter
+    def board(self, board):
+        self.bits = board_to_bits(board)
+
+    def get_cell(self, i, j):
+        e = (self.bits >> (4 * (SIZE * i + j))) & CELL_MASK
+        return 1 << e if e else None
+
+    def place_new_tile(self):
+        empty_spots = [k for k in range(SIZE * SIZE) if not (self.bits >> (4 * k)) & CELL_MASK]
+        if not empty_spots:
+            return None
+        k = self.rng.choice(empty_spots)
+        # Показатель 1 - плитка 2, показатель 2 - плитка 4 (порядок выборов как в GameLogic)
+        self.bits |= (2 if self.four_probability and self.rng.random() < self.four_probability else 1) << (4 * k)
+        return divmod(k, SIZE)
+
+    def place_tile(self, i, j, value):
+        """Плитка value на пустой клетке (i, j)."""
+        shift = 4 * (SIZE * i + j)
+        if (self.bits >> shift) & CELL_MASK:
+            raise ValueError(f"Клетка ({i}, {j}) занята")
+        self.bits |= min(value.bit_length() - 1, MAX_EXPONENT) << shift
+
+    def move(self, direction):
+        """
+        Ход в направлении 'left', 'right', 'up' или 'down'.
+
+        Для вертикальных ходов столбцы становятся строками (транспонирование),
+        а результат берётся из таблиц, где он уже разложен обратно в столбец.
+
+        :return: True, если поле изменилось
+        """
+        bits = self.bits
+        if direction == 'left' or direction == 'right':
+            if direction == 'left':
+                table, score = self._row_left, self._score_left
+            else:
+                table, score = self._row_right, self._score_right
+            r0, r1, r2, r3 = bits & ROW_MASK, (bits >> 16) & ROW_MASK, (bits >> 32) & ROW_MASK, bits >> 48
+            new_bits = table[r0] | table[r1] << 16 | table[r2] << 32 | table[r3] << 48
+        elif direction == 'up' or direction == 'down':
+            if direction == 'up':
+                table, score = self._column_up, self._score_left
+            else:
+                table, score = self._column_down, self._score_right
+            columns = transpose(bits)
+            r0, r1, r2, r3 = columns & ROW_MASK, (columns >> 16) & ROW_MASK, (columns >> 32) & ROW_MASK, columns >> 48
+            new_bits = table[r0] | table[r1] << 4 | table[r2] << 8 | table[r3] << 12
+        else:
+            raise ValueError(f"Неизвестное направление хода: {direction}")
+        self.bits = new_bits
+        self.score += score[r0] + score[r1] + score[r2] + score[r3]
+        return new_bits != bits
+
+    def move_left(self):
+        return self.move('left')
+
+    def copy(self):
+        """Независимая копия поля и счёта (генератор случайных чисел общий)."""
+        clone = BitboardLogic(self.rng, self.four_probability)
+        clone.bits = self.bits
+        clone.score = self.score
+        return clone
+
+    def rotate(self):
+        """Поворот поля по часовой стрелке (как GameLogic.rotate)."""
+        rotated = 0
+        for i in range(SIZE):
+            for j in range(SIZE):
+                e = (self.bits >> (4 * (SIZE * i + j))) & CELL_MASK
+                rotated |= e << (4 * (SIZE * j + SIZE - 1 - i))
+        self.bits = rotated
+
+    def can_move(self):
+        for i in range(SIZE):
+            for j in range(SIZE):
+                e = (self.bits >> (4 * (SIZE * i + j))) & CELL_MASK
+                if not e:
+                    return True
+                if e == MAX_EXPONENT:
+                    continue
+                if i > 0 and e == (self.bits >> (4 * (SIZE * (i - 1) + j))) & CELL_MASK:
+                    return True
+                if j > 0 and e == (self.bits >> (4 * (SIZE * i + j - 1))) & CELL_MASK:
+                    return True
+        return False
@@ -1,16 +1,64 @@
-import json
+import argparse
+import os
+import queue
 import sys
-from random import choice
-from PySide6.QtWidgets import *
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QFont
+import time
+from collections import deque
+
+if not __package__:
+    # Запуск как скрипта (python exam/exam_game_2048.py): подключаем пакет exam
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = "exam"
+
+# Только используемые классы: консольная логика (game_logic_2048 и др.) Qt не импортирует вовсе
+from PySide6.QtWidgets import (QApplication, QFrame, QGridLayout, QHBoxLayout, QLabel, QMainWindow, QMessageBox,
+                               QPushButton, QSizePolicy, QVBoxLayout, QWidget)
+from PySide6.QtCore import Qt, QEvent, QRectF, QThread, QTimer, QVariantAnimation, Signal
+from PySide6.QtGui import QColor, QFont, QPainter, QPixmap
+
+from .bitboard_2048 import BitboardLogic, board_to_bits
+from .game_logic_2048 import MAX_SIZE, MIN_SIZE, GameLogic, move_transitions
+from .history_2048 import History
+from .replay_2048 import ReplayWriter
+from .rng_2048 import SplitMix64
+
+ARROWS = {'left': '←', 'right': '→', 'up': '↑', 'down': '↓'}
+KEY_DIRECTIONS = {Qt.Key_Left: 'left', Qt.Key_Right: 'right', Qt.Key_Up: 'up', Qt.Key_Down: 'down'}
+FRAME_MS = 16  # Период кадра: накопленные ходы применяются и поле перерисовывается раз в кадр
+MAX_PENDING_MOVES = 8  # Ходы сверх этого при удержании клавиши отбрасываются, чтобы игра не убегала вперёд
+LATENCY_SAMPLES = 1000  # Сколько последних замеров задержки ввод-отрисовка хранится
 
 
 # ---------- Определение модели плитки ----------
+TILE_COLORS = {
+    None: "#BBADA0",
+    2: "#EEE4DA", 4: "#EDE0C8", 8: "#F2B179", 16: "#F59563",
+    32: "#F67C5F", 64: "#F65E3B", 128: "#EDCF72", 256: "#EDCC61",
+    512: "#EDC850", 1024: "#EDC53F", 2048: "#EDC22E"
+}
+
+
+def tile_style(value):
+    bg_color = TILE_COLORS.get(value, "#BBADA0")
+    fg_color = "black" if isinstance(value, int) and value <= 4 else "white"
+    return f"QLabel {{ background-color: {bg_color}; color: {fg_color}; }}"
+
+
+# Стили плиток вычисляются один раз для каждого значения
+TILE_STYLES = {value: tile_style(value) for value in TILE_COLORS}
+
+
 class Tile(QLabel):
+    # Счётчики для замеров по всем плиткам: вызовы setStyleSheet,
+    # переполировки стиля (событие StyleChange) и перерисовки
+    style_count = 0
+    polish_count = 0
+    paint_count = 0
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.value = None
+        self._style_sheet = None  # Текущая строка стиля (общая для всех плиток с тем же значением)
         self.setAlignment(Qt.AlignCenter)
         self.setFont(QFont("Arial", 24))
         # Гибкая политика размера для адаптации
@@ -23,106 +71,332 @@ class Tile(QLabel):
         self.update_style()
 
     def set_value(self, val):
+        """
+        Установка значения плитки.
+
+        :return: True, если значение изменилось и плитка перерисовывается
+        """
+        if val == self.value:
+            return False
         self.value = val
         self.setText(str(val)) if val else self.clear()
         self.update_style()
+        return True
 
     def update_style(self):
-        colors = {
-            None: "#BBADA0",
-            2: "#EEE4DA", 4: "#EDE0C8", 8: "#F2B179", 16: "#F59563",
-            32: "#F67C5F", 64: "#F65E3B", 128: "#EDCF72", 256: "#EDCC61",
-            512: "#EDC850", 1024: "#EDC53F", 2048: "#EDC22E"
-        }
-        bg_color = colors.get(self.value, "#BBADA0")
-        fg_color = "black" if isinstance(self.value, int) and self.value <= 4 else "white"
-        style = f"QLabel {{ background-color: {bg_color}; color: {fg_color}; }}"
-        self.setStyleSheet(style)
-
-
-# ---------- Логика игры ----------
-class GameLogic:
-    def __init__(self):
-        self.board = [[None for _ in range(4)] for _ in range(4)]
-        self.score = 0
-
-    def reset(self):
-        self.board = [[None for _ in range(4)] for _ in range(4)]
-        self.score = 0
-
-    def place_new_tile(self):
-        empty_spots = [(i, j) for i in range(4) for j in range(4) if self.board[i][j] is None]
-        if empty_spots:
-            pos = choice(empty_spots)
-            self.board[pos[0]][pos[1]] = 2
-
-    def merge_row(self, row):
-        temp = [val for val in row if val is not None]
-        result = []
-        i = 0
-        while i < len(temp):
-            if i + 1 < len(temp) and temp[i] == temp[i + 1]:
-                result.append(temp[i] * 2)
-                self.score += temp[i] * 2
-                i += 2
-            else:
-                result.append(temp[i])
-                i += 1
-        return result + [None] * (len(row) - len(result))
-
-    def move_left(self):
-        changed = False
-        for i in range(4):
-            old_row = list(self.board[i])
-            new_row = self.merge_row(old_row)
-            if old_row != new_row:
-                changed = True
-            self.board[i] = new_row
+        style = TILE_STYLES.get(self.value)
+        if style is None:
+            style = TILE_STYLES.setdefault(self.value, tile_style(self.value))
+        # setStyleSheet заново разбирает стиль и полирует виджет, поэтому только при смене стиля
+        if style is not self._style_sheet:
+            self._style_sheet = style
+            self.setStyleSheet(style)
+            Tile.style_count += 1
+
+    def event(self, event):
+        if event.type() == QEvent.StyleChange:
+            Tile.polish_count += 1
+        return super().event(event)
+
+    def paintEvent(self, event):
+        Tile.paint_count += 1
+        super().paintEvent(event)
+
+    @classmethod
+    def stats(cls):
+        return {"styles": cls.style_count, "polishes": cls.polish_count, "paints": cls.paint_count}
+
+
+# ---------- Поле, нарисованное одним виджетом ----------
+class BoardCanvas(QWidget):
+    """
+    Всё поле рисуется в одном paintEvent вместо 16 отдельных виджетов Tile.
+
+    Картинка плитки каждого значения рисуется один раз для текущего размера
+    клетки и затем только копируется; при изменении размера кэш сбрасывается.
+
+    Анимация хода (сдвиг плиток, затем "пульс" объединённых и появление новой)
+    идёт от одной QVariantAnimation: каждый её шаг - одна перерисовка всего поля.
+    """
+    BOARD_COLOR = QColor("#A39489")
+    GAP = 6  # Промежуток между плитками в пикселях
+    ANIMATION_MS = 120  # Длительность анимации хода
+    SLIDE_PART = 0.6  # Доля анимации, за которую плитки доезжают до новых клеток
+    paint_count = 0  # Счётчик перерисовок для замеров
+
+    def __init__(self, size=4, parent=None):
+        super().__init__(parent)
+        self.size = size
+        self.board = [[None] * size for _ in range(size)]
+        self.pixmaps = {}  # Значение плитки -> QPixmap для текущего размера клетки
+        size_policy = QSizePolicy(QSizePolicy.MinimumExpanding, QSizePolicy.MinimumExpanding)
+        self.setSizePolicy(size_policy)
+        self.setMinimumSize(30 * size, 30 * size)
+        self.transitions = None  # Переезды плиток текущей анимации (см. move_transitions)
+        self.merged = set()  # Клетки, в которых плитки объединились
+        self.spawn = None  # Клетка новой плитки
+        self.animation = QVariantAnimation(self)
+        self.animation.setStartValue(0.0)
+        self.animation.setEndValue(1.0)
+        self.animation.setDuration(self.ANIMATION_MS)
+        self.animation.valueChanged.connect(self.update)
+        self.animation.finished.connect(self.finish_animation)
+
+    def animate(self, transitions, spawn=None):
+        """Анимация перехода к текущему полю; предыдущая анимация прерывается."""
+        self.animation.stop()
+        self.transitions = transitions
+        self.merged = {(new_i, new_j) for _, _, new_i, new_j, _, merged in transitions if merged}
+        self.spawn = spawn
+        self.animation.start()
+
+    def finish_animation(self):
+        """Пропуск анимации: сразу рисуется итоговое поле."""
+        if self.transitions is not None:
+            self.animation.stop()
+            self.transitions = None
+            self.update()
+
+    def set_board(self, board):
+        """
+        Новое состояние поля; перерисовка запрашивается, только если оно изменилось.
+
+        :return: число изменившихся клеток
+        """
+        changed = sum(old != new for old_row, new_row in zip(self.board, board)
+                      for old, new in zip(old_row, new_row))
+        if changed:
+            self.board = [list(row) for row in board]
+            self.update()
         return changed
 
-    def rotate(self):
-        n = len(self.board)
-        rotated = [[None] * n for _ in range(n)]
-        for i in range(n):
-            for j in range(n):
-                rotated[j][n - 1 - i] = self.board[i][j]
-        self.board = rotated
-
-    def can_move(self):
-        for i in range(4):
-            for j in range(4):
-                if self.board[i][j] is None:
-                    return True
-                if (i > 0 and self.board[i][j] == self.board[i - 1][j]) or (
-                        j > 0 and self.board[i][j] == self.board[i][j - 1]):
-                    return True
-        return False
+    def cell_geometry(self):
+        """Размер клетки и смещение поля, чтобы оно было квадратным и по центру."""
+        side = min(self.width(), self.height())
+        cell = max(1, (side - self.GAP * (self.size + 1)) // self.size)
+        board_side = cell * self.size + self.GAP * (self.size + 1)
+        return cell, (self.width() - board_side) // 2, (self.height() - board_side) // 2
+
+    def tile_pixmap(self, value, cell):
+        pixmap = self.pixmaps.get(value)
+        if pixmap is not None:
+            return pixmap
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(round(cell * ratio), round(cell * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(TILE_COLORS.get(value, "#3C3A32")))
+        painter.drawRoundedRect(QRectF(0, 0, cell, cell), cell * 0.06, cell * 0.06)
+        if value:
+            text = str(value)
+            font = QFont("Arial")
+            # Чем больше цифр, тем мельче шрифт, чтобы число помещалось в клетку
+            font.setPixelSize(max(6, int(cell * min(0.5, 1.2 / (len(text) + 0.5)))))
+            font.setBold(True)
+            painter.setFont(font)
+            painter.setPen(QColor("black" if value <= 4 else "white"))
+            painter.drawText(QRectF(0, 0, cell, cell), Qt.AlignCenter, text)
+        painter.end()
+        self.pixmaps[value] = pixmap
+        return pixmap
+
+    def resizeEvent(self, event):
+        self.pixmaps.clear()
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        BoardCanvas.paint_count += 1
+        cell, left, top = self.cell_geometry()
+        painter = QPainter(self)
+        board_side = cell * self.size + self.GAP * (self.size + 1)
+        painter.fillRect(left, top, board_side, board_side, self.BOARD_COLOR)
+        step = cell + self.GAP
+        left += self.GAP
+        top += self.GAP
+        if self.transitions is None:
+            for i, row in enumerate(self.board):
+                for j, value in enumerate(row):
+                    painter.drawPixmap(left + j * step, top + i * step, self.tile_pixmap(value, cell))
+        else:
+            self.paint_animation(painter, cell, left, top, step, self.animation.currentValue() or 0.0)
+        painter.end()
+
+    def paint_animation(self, painter, cell, left, top, step, progress):
+        empty = self.tile_pixmap(None, cell)
+        for i in range(self.size):
+            for j in range(self.size):
+                painter.drawPixmap(left + j * step, top + i * step, empty)
+        if progress < self.SLIDE_PART:
+            # Сдвиг: плитки со старыми значениями едут из старых клеток в новые
+            t = progress / self.SLIDE_PART
+            for i, j, new_i, new_j, value, _ in self.transitions:
+                x = left + (j + (new_j - j) * t) * step
+                y = top + (i + (new_i - i) * t) * step
+                painter.drawPixmap(QRectF(x, y, cell, cell), self.tile_pixmap(value, cell), QRectF())
+            return
+        # Итоговое поле: объединённые плитки увеличиваются и возвращаются к размеру клетки,
+        # новая плитка проявляется из центра клетки
+        t = (progress - self.SLIDE_PART) / (1.0 - self.SLIDE_PART)
+        for i, row in enumerate(self.board):
+            for j, value in enumerate(row):
+                if value is None:
+                    continue
+                if (i, j) == self.spawn:
+                    scale = 0.3 + 0.7 * t
+                    painter.setOpacity(t)
+                elif (i, j) in self.merged:
+                    scale = 1.0 + 0.2 * (1.0 - abs(2.0 * t - 1.0))
+                else:
+                    scale = 1.0
+                side = cell * scale
+                x = left + j * step + (cell - side) / 2
+                y = top + i * step + (cell - side) / 2
+                painter.drawPixmap(QRectF(x, y, side, side), self.tile_pixmap(value, cell), QRectF())
+                painter.setOpacity(1.0)
+
+
+# ---------- Поиск хода в отдельном потоке ----------
+class ExpectimaxWorker(QThread):
+    moveChosen = Signal(str)  # Направление найденного хода
+
+    def __init__(self, solver, bits, parent=None):
+        super().__init__(parent)
+        self.solver = solver
+        self.bits = bits  # Снимок поля: логика игры из потока не читается
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self) -> None:
+        direction = self.solver.choose(self.bits, should_stop=lambda: self.cancelled)
+        if direction is not None and not self.cancelled:
+            self.moveChosen.emit(direction)
+
+
+# ---------- Запись результатов в отдельном потоке ----------
+class ScoreWorker(QThread):
+    """
+    Все обращения к базе результатов (ScoreStore) выполняются в этом потоке.
+
+    GUI только кладёт запросы в очередь, поэтому медленный диск (например,
+    сетевой домашний каталог) не задерживает обработку клавиш. Накопившиеся
+    запросы обрабатываются пачкой: все результаты записываются одной
+    транзакцией, затем отправляются запрошенные сводки.
+    """
+    statsLoaded = Signal(int, object)  # Размер поля, {"top": [...], "games": n, "median": m}
+    errorOccurred = Signal(str)
+
+    def __init__(self, path=None, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.requests = queue.Queue()
+
+    def add_result(self, size, score, max_tile, moves, duration):
+        self.requests.put(("add", (size, score, max_tile, moves, duration, time.time())))
+
+    def request_stats(self, size):
+        self.requests.put(("stats", size))
+
+    def stop(self):
+        """Запись оставшихся в очереди результатов и завершение потока (запускается, если ещё не был)."""
+        if self.isFinished():
+            return
+        if not self.isRunning():
+            self.start()
+        self.requests.put(None)
+        self.wait()
+
+    def run(self) -> None:
+        # sqlite3 и json загружаются уже в этом потоке и не задерживают первую отрисовку
+        import sqlite3
+        from .score_store_2048 import ScoreStore
+        try:
+            # Соединение SQLite принадлежит потоку, в котором создано
+            store = ScoreStore(self.path)
+            # Результаты из best_scores.json прежних версий переносятся в базу один раз
+            store.migrate_json()
+        except (OSError, sqlite3.Error) as error:
+            self.errorOccurred.emit(f"База результатов недоступна: {error}")
+            return
+        try:
+            running = True
+            while running:
+                batch = [self.requests.get()]
+                while True:
+                    try:
+                        batch.append(self.requests.get_nowait())
+                    except queue.Empty:
+                        break
+                if None in batch:
+                    running = False
+                    batch = batch[:batch.index(None)]
+                self.process(store, batch)
+        finally:
+            store.close()
+
+    def process(self, store, batch):
+        import sqlite3
+        results = [data for kind, data in batch if kind == "add"]
+        sizes = {data for kind, data in batch if kind == "stats"}
+        try:
+            if results:
+                store.add_many(results)
+            for size in sizes:
+                self.statsLoaded.emit(size, {"top": store.top(size, 5), "games": store.count(size),
+                                             "median": store.percentile(size, 50)})
+        except sqlite3.Error as error:
+            self.errorOccurred.emit(f"Не удалось сохранить результат: {error}")
 
 
 # ---------- Виджет игры ----------
 class GameView(QWidget):
-    def __init__(self, logic):
+    def __init__(self, logic, canvas=False, record_dir=None, scores_path=None, animate=True):
         super().__init__()
         self.logic = logic
-        self.best_scores = []  # Лучшие результаты
+        self.use_canvas = canvas  # Рисовать поле одним виджетом BoardCanvas вместо плиток Tile
+        self.animate = canvas and animate  # Анимация ходов (только для BoardCanvas)
+        self.pending_animation = None  # (поле до хода, направление, новая плитка) последнего хода кадра
+        self.record_dir = record_dir  # Каталог для записей партий (None - не записывать)
+        self.recorder = None  # ReplayWriter текущей партии
+        self.history = History(logic.size)  # Состояния партии для отмены и повтора ходов
+        self.solver = None  # ExpectimaxSolver создаётся при первой подсказке
+        self.ai_worker = None  # Текущий поток поиска хода
+        self.last_update_tiles = 0  # Число плиток, изменённых последним update_view
+        self.best_scores = []  # Лучшие результаты для текущего размера поля
+        self.score_stats = {}  # Последняя сводка из базы: число партий и медиана
+        self.started_at = time.monotonic()  # Начало текущей партии
+        self.saved_end = None  # Конец текущей партии, результат которого уже в базе
+        self.score_worker = ScoreWorker(scores_path, self)
+        self.score_worker.statsLoaded.connect(self.on_stats_loaded)
+        self.score_worker.errorOccurred.connect(lambda message: self.hint_label.setText(message))
+        self.score_worker_started = False  # Поток запускается после первой отрисовки поля
+        self.pending_moves = deque()  # Очередь ходов: (направление, время нажатия)
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setTimerType(Qt.PreciseTimer)
+        self.frame_timer.setInterval(FRAME_MS)
+        self.frame_timer.timeout.connect(self.on_frame)
+        self.paint_waiting = []  # Время нажатия ходов, которые применены, но ещё не нарисованы
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)  # Задержки ввод-отрисовка в секундах
         self.load_best_scores()
         self.init_ui()
 
     def load_best_scores(self):
-        try:
-            with open("best_scores.json", "r") as file:
-                data = json.load(file)
-                self.best_scores = sorted(data["scores"], reverse=True)[:5]
-        except FileNotFoundError:
-            pass
+        """Запрос сводки из базы; ответ придёт сигналом statsLoaded."""
+        self.score_worker.request_stats(self.logic.size)
 
-    def save_best_scores(self):
-        scores_data = {"scores": self.best_scores}
-        with open("best_scores.json", "w") as file:
-            json.dump(scores_data, file)
+    def on_stats_loaded(self, size, stats):
+        if size == self.logic.size:
+            self.best_scores = stats["top"]
+            self.score_stats = stats
 
     def show_best_scores(self):
         message = "\n".join([f"{score}" for score in self.best_scores])
+        if self.score_stats.get("games"):
+            message += f"\n\nПартий: {self.score_stats['games']}, медиана: {self.score_stats['median']}"
         QMessageBox.information(self, "Лучшие результаты", message)
 
     def init_ui(self):
@@ -130,12 +404,43 @@ class GameView(QWidget):
         score_label = QLabel(f"Счёт: {self.logic.score}")
         layout.addWidget(score_label)
 
-        grid = QGridLayout()
-        self.tiles = [[Tile() for _ in range(4)] for _ in range(4)]
-        for i in range(4):
-            for j in range(4):
-                grid.addWidget(self.tiles[i][j], i, j)
-        layout.addLayout(grid)
+        n = self.logic.size
+        if self.use_canvas:
+            self.canvas = BoardCanvas(n)
+            layout.addWidget(self.canvas)
+            self.canvas.installEventFilter(self)
+        else:
+            grid = QGridLayout()
+            self.tiles = [[Tile() for _ in range(n)] for _ in range(n)]
+            for i in range(n):
+                for j in range(n):
+                    if n > 4:
+                        # На больших полях плитки и шрифт уменьшаются, чтобы окно помещалось на экран
+                        self.tiles[i][j].setMinimumSize(max(24, 200 // n), max(24, 200 // n))
+                        self.tiles[i][j].setFont(QFont("Arial", max(8, 96 // n)))
+                    grid.addWidget(self.tiles[i][j], i, j)
+                    self.tiles[i][j].installEventFilter(self)
+            layout.addLayout(grid)
+
+        self.hint_label = QLabel("")
+        layout.addWidget(self.hint_label)
+
+        # Кнопки подсказки и автоигры не забирают фокус, чтобы стрелки продолжали работать
+        # Поиск хода работает с битовым полем, поэтому только для поля 4x4
+        ai_layout = QHBoxLayout()
+        hint_btn = QPushButton("Подсказка")
+        hint_btn.setFocusPolicy(Qt.NoFocus)
+        hint_btn.clicked.connect(lambda: self.start_search(autoplay=False))
+        ai_layout.addWidget(hint_btn)
+
+        self.autoplay_btn = QPushButton("Автоигра")
+        self.autoplay_btn.setCheckable(True)
+        self.autoplay_btn.setFocusPolicy(Qt.NoFocus)
+        self.autoplay_btn.toggled.connect(self.toggle_autoplay)
+        ai_layout.addWidget(self.autoplay_btn)
+        hint_btn.setEnabled(self.logic.size == 4)
+        self.autoplay_btn.setEnabled(self.logic.size == 4)
+        layout.addLayout(ai_layout)
 
         # Создаем горизонтальное распределение для двух кнопок
         button_layout = QHBoxLayout()
@@ -152,81 +457,317 @@ class GameView(QWidget):
         self.update_view()
 
     def on_move(self, direction):
-        if direction == 'left':
-            self.logic.move_left()
-        elif direction == 'right':
-            self.logic.rotate();
-            self.logic.rotate();
-            self.logic.move_left();
-            self.logic.rotate();
-            self.logic.rotate()
-        elif direction == 'up':
-            self.logic.rotate();
-            self.logic.rotate();
-            self.logic.rotate();
-            self.logic.move_left();
-            self.logic.rotate()
-        elif direction == 'down':
-            self.logic.rotate();
-            self.logic.move_left();
-            self.logic.rotate();
-            self.logic.rotate();
-            self.logic.rotate()
-        self.logic.place_new_tile()
+        """Ход с немедленной перерисовкой (ходы с клавиатуры идут через queue_move)."""
+        if self.step(direction):
+            self.finish_frame()
+
+    def queue_move(self, direction):
+        """
+        Ход с клавиатуры.
+
+        Первый ход после паузы применяется сразу; ходы, пришедшие быстрее кадра
+        (автоповтор клавиши), копятся и применяются пачкой на следующем тике
+        с одной перерисовкой.
+        """
+        if len(self.pending_moves) >= MAX_PENDING_MOVES:
+            return
+        self.pending_moves.append((direction, time.perf_counter()))
+        if not self.frame_timer.isActive():
+            self.on_frame()
+            self.frame_timer.start()
+
+    def on_frame(self):
+        if not self.pending_moves:
+            # Ввода нет - таймер не будит приложение
+            self.frame_timer.stop()
+            return
+        changed = 0
+        while self.pending_moves:
+            direction, pressed_at = self.pending_moves.popleft()
+            if self.step(direction):
+                changed += 1
+                self.paint_waiting.append(pressed_at)
+        if changed > 1:
+            # Ходы приходят быстрее, чем проигрывается анимация: промежуточные поля не показываются
+            self.pending_animation = None
+        if changed:
+            self.finish_frame()
+
+    def step(self, direction):
+        """
+        Ход логики без перерисовки: ход, новая плитка, история и запись партии.
+
+        :return: True, если поле изменилось
+        """
+        if self.recorder is None and self.record_dir is not None and self.logic.copy().move(direction):
+            # После отмены хода запись продолжается в новом файле с текущего поля, но только
+            # если ход что-то изменит: иначе остался бы пустой файл и сменился бы генератор
+            self.start_recording()
+        old_board = [row[:] for row in self.logic.board] if self.animate else None
+        # Новая плитка появляется только после хода, который изменил поле
+        if not self.logic.move(direction):
+            return False
+        spawn = self.logic.place_new_tile()
+        if self.animate:
+            self.pending_animation = (old_board, direction, spawn)
+        self.history.push(self.logic.board, self.logic.score)
+        if self.recorder is not None:
+            self.recorder.record(direction, spawn and (*spawn, self.logic.board[spawn[0]][spawn[1]]))
+        return True
+
+    def finish_frame(self):
+        """Перерисовка после одного или нескольких ходов и проверка конца игры."""
+        if self.recorder is not None:
+            # Запись сбрасывается на диск сразу: её можно приложить к отчёту об ошибке
+            self.recorder.flush()
         self.update_view()
         if not self.logic.can_move():
+            self.pending_moves.clear()
+            self.stop_recording()
             QMessageBox.information(self, "", "Игра закончена!")
             self.save_result()
 
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint:
+            # Первая отрисовка поля после применённых ходов завершает замер задержки
+            if self.paint_waiting:
+                now = time.perf_counter()
+                self.latencies.extend(now - pressed_at for pressed_at in self.paint_waiting)
+                self.paint_waiting.clear()
+            if not self.score_worker_started:
+                # База результатов (sqlite3) загружается, когда поле уже нарисовано, чтобы не задерживать запуск
+                self.score_worker_started = True
+                QTimer.singleShot(0, self.start_score_worker)
+        return super().eventFilter(watched, event)
+
+    def start_score_worker(self):
+        # Поток мог быть уже остановлен при закрытии окна: QThread после завершения запустился бы заново
+        if not self.score_worker.isRunning() and not self.score_worker.isFinished():
+            self.score_worker.start()
+
+    def latency_stats(self):
+        """Задержка от нажатия до отрисовки в миллисекундах: число замеров, медиана, p95, максимум."""
+        values = sorted(self.latencies)
+        if not values:
+            return {"samples": 0}
+        return {"samples": len(values), "p50": values[len(values) // 2] * 1000,
+                "p95": values[min(len(values) - 1, len(values) * 95 // 100)] * 1000, "max": values[-1] * 1000}
+
     def reset_game(self):
+        self.stop_ai()
+        self.pending_moves.clear()
         self.logic.reset()
+        self.start_game()
+
+    def start_game(self):
+        """Две начальные плитки на пустом поле и, если нужно, начало записи партии."""
+        # Ход по пустому полю ничего не меняет, поэтому новая игра начинается с двух плиток
+        self.logic.place_new_tile()
+        self.logic.place_new_tile()
+        self.history.clear()
+        self.history.push(self.logic.board, self.logic.score)
+        self.started_at = time.monotonic()
+        self.saved_end = None
+        self.start_recording()
         self.update_view()
 
+    def start_recording(self):
+        """Новая запись партии с текущего поля (если задан каталог записей)."""
+        self.stop_recording()
+        if self.record_dir is None:
+            return
+        # Генератор логики не заменяется (его мог передать вызывающий код): новые плитки записываются явно,
+        # а зерно известно только у SplitMix64 - его состояние продолжает ту же последовательность
+        rng = self.logic.rng
+        seed = rng.state if isinstance(rng, SplitMix64) else 0
+        os.makedirs(self.record_dir, exist_ok=True)
+        stem = os.path.join(self.record_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{seed:016x}")
+        path, k = f"{stem}.2048", 1
+        while os.path.exists(path):
+            # Несколько записей за секунду (например, после отмены ходов) с одним зерном
+            path, k = f"{stem}-{k}.2048", k + 1
+        self.recorder = ReplayWriter(open(path, "wb"), self.logic, seed)
+
+    def stop_recording(self):
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+
+    def undo(self):
+        self.restore(self.history.undo())
+
+    def redo(self):
+        self.restore(self.history.redo())
+
+    def restore(self, state):
+        """Переход к состоянию из истории; запись партии прерывается до следующего хода."""
+        if state is None:
+            return
+        self.stop_ai()
+        self.pending_moves.clear()
+        self.stop_recording()
+        self.logic.board, self.logic.score = state
+        self.update_view()
+
+    def current_bits(self):
+        """Поле в битовом виде для поиска хода (BitboardLogic хранит его сразу)."""
+        bits = getattr(self.logic, 'bits', None)
+        return bits if bits is not None else board_to_bits(self.logic.board)
+
+    def start_search(self, autoplay):
+        """Запуск поиска хода: подсказка или очередной ход автоигры."""
+        self.stop_search()
+        if self.solver is None:
+            from .expectimax_2048 import ExpectimaxSolver
+            # Поиск усредняет новые плитки с теми же вероятностями, что и логика игры
+            self.solver = ExpectimaxSolver(time_budget=0.15,
+                                           four_probability=getattr(self.logic, 'four_probability', 0.0))
+        self.ai_worker = ExpectimaxWorker(self.solver, self.current_bits(), self)
+        self.ai_worker.moveChosen.connect(self.on_ai_move if autoplay else self.show_hint)
+        self.ai_worker.start()
+
+    def stop_search(self):
+        """Отмена поиска; поток проверяет флаг отмены и завершается за доли миллисекунды."""
+        if self.ai_worker is not None:
+            self.ai_worker.cancel()
+            self.ai_worker.wait()
+            self.ai_worker.deleteLater()
+            self.ai_worker = None
+
+    def stop_ai(self):
+        """Остановка поиска и автоигры (например, при нажатии клавиши)."""
+        self.autoplay_btn.setChecked(False)
+        self.stop_search()
+        self.hint_label.clear()
+
+    def toggle_autoplay(self, checked):
+        if checked:
+            self.start_search(autoplay=True)
+        else:
+            self.stop_search()
+
+    def on_ai_move(self, direction):
+        # Ход мог прийти уже после отмены: такой результат отбрасываем
+        if self.sender() is not self.ai_worker or self.ai_worker.cancelled:
+            return
+        self.on_move(direction)
+        if self.autoplay_btn.isChecked() and self.logic.can_move():
+            self.start_search(autoplay=True)
+        else:
+            self.autoplay_btn.setChecked(False)
+
+    def show_hint(self, direction):
+        if self.sender() is self.ai_worker:
+            self.hint_label.setText(f"Подсказка: {ARROWS[direction]}")
+
     def update_view(self):
-        for i in range(4):
-            for j in range(4):
-                self.tiles[i][j].set_value(self.logic.board[i][j])
+        """Обновляются только плитки, значение которых изменилось."""
+        board = self.logic.board  # BitboardLogic собирает список при каждом обращении
+        if self.use_canvas:
+            changed = self.canvas.set_board(board)
+            animation, self.pending_animation = self.pending_animation, None
+            if animation is not None:
+                old_board, direction, spawn = animation
+                self.canvas.animate(move_transitions(old_board, direction), spawn)
+            else:
+                # Поле сменилось без хода (отмена, новая игра): анимация не нужна
+                self.canvas.finish_animation()
+        else:
+            changed = 0
+            for tile_row, row in zip(self.tiles, board):
+                for tile, val in zip(tile_row, row):
+                    changed += tile.set_value(val)
+        self.last_update_tiles = changed
         score_label = self.layout().itemAt(0).widget()
         score_label.setText(f"Счёт: {self.logic.score}")
 
     def save_result(self):
-        current_score = self.logic.score
-        if current_score > 0:
-            self.best_scores.append(current_score)
-            self.best_scores.sort(reverse=True)
-            self.best_scores = self.best_scores[:5]
-            self.save_best_scores()
+        """Результат законченной партии в базу; число ходов - позиция в истории (без отменённых)."""
+        board = self.logic.board
+        # Повтор отменённых ходов до того же конца не сохраняется второй раз, другой конец после отмены - сохраняется
+        end = (self.history.position, self.logic.score, tuple(map(tuple, board)))
+        if end == self.saved_end:
+            return
+        self.saved_end = end
+        max_tile = max(val or 0 for row in board for val in row)
+        self.score_worker.add_result(self.logic.size, self.logic.score, max_tile, self.history.position,
+                                     time.monotonic() - self.started_at)
+        self.load_best_scores()
+
+    def shutdown(self):
+        """Остановка фоновых потоков и запись несохранённых результатов перед закрытием."""
+        self.stop_ai()
+        self.stop_recording()
+        self.score_worker.stop()
+
+    def closeEvent(self, event):
+        # GameView как отдельное окно (например, в замерах); внутри MainWindow вызывается из его closeEvent
+        self.shutdown()
+        super().closeEvent(event)
 
 
 # ---------- Главное окно приложения ----------
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, logic=None, canvas=False, record_dir=None, animate=True):
         super().__init__()
         self.setWindowTitle("Игра 2048")
         # Позволяет оконному менеджеру самостоятельно определять размеры окна
         self.resize(400, 300)
         # Получение фокуса клавиатуры
         self.setFocusPolicy(Qt.StrongFocus)
-        self.game_logic = GameLogic()
-        self.game_view = GameView(self.game_logic)
+        # Логика может быть любой с интерфейсом GameLogic; по умолчанию - табличная на 64-битном поле
+        self.game_logic = logic if logic is not None else BitboardLogic()
+        self.game_view = GameView(self.game_logic, canvas, record_dir, animate=animate)
         self.setCentralWidget(self.game_view)
-        self.game_logic.place_new_tile()
-        self.game_logic.place_new_tile()
-        self.game_view.update_view()
+        self.game_view.start_game()
+
+    def closeEvent(self, event):
+        self.game_view.shutdown()
+        super().closeEvent(event)
 
     def keyPressEvent(self, event):
-        if event.key() == Qt.Key_Up:
-            self.game_view.on_move('up')
-        elif event.key() == Qt.Key_Left:
-            self.game_view.on_move('left')
-        elif event.key() == Qt.Key_Right:
-            self.game_view.on_move('right')
-        elif event.key() == Qt.Key_Down:
-            self.game_view.on_move('down')
+        if event.modifiers() & Qt.ControlModifier:
+            # Ctrl+Z - отмена хода, Ctrl+Y или Ctrl+Shift+Z - повтор
+            shift = bool(event.modifiers() & Qt.ShiftModifier)
+            if event.key() == Qt.Key_Y or (event.key() == Qt.Key_Z and shift):
+                self.game_view.redo()
+            elif event.key() == Qt.Key_Z:
+                self.game_view.undo()
+            return
+        direction = KEY_DIRECTIONS.get(event.key())
+        if direction is not None:
+            # Ход игрока отменяет подсказку и автоигру
+            self.game_view.stop_ai()
+            self.game_view.queue_move(direction)
 
 
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
-    window = MainWindow()
+    parser = argparse.ArgumentParser(description="Игра 2048")
+    parser.add_argument("--lists", action="store_true",
+                        help="логика на списках (для 4x4 по умолчанию - на 64-битном поле)")
+    parser.add_argument("--canvas", action="store_true", help="рисовать поле одним виджетом BoardCanvas")
+    parser.add_argument("--no-animation", action="store_true", help="не анимировать ходы на BoardCanvas")
+    parser.add_argument("--size", type=int, default=4, help=f"размер поля (от {MIN_SIZE} до {MAX_SIZE})")
+    parser.add_argument("--four-probability", type=float, default=0.0,
+                        help="вероятность новой плитки 4 (0.1 - как в классической игре)")
+    parser.add_argument("--latency", action="store_true", help="при выходе вывести задержку ввод-отрисовка")
+    parser.add_argument("--record", metavar="DIR", help="записывать партии в каталог DIR (см. replay_2048)")
+    args, qt_args = parser.parse_known_args()
+    if not MIN_SIZE <= args.size <= MAX_SIZE:
+        parser.error(f"размер поля должен быть от {MIN_SIZE} до {MAX_SIZE}")
+    if not 0.0 <= args.four_probability <= 1.0:
+        parser.error("вероятность плитки 4 должна быть от 0 до 1")
+    app = QApplication(sys.argv[:1] + qt_args)
+    if args.size == 4 and not args.lists:
+        logic = BitboardLogic(four_probability=args.four_probability)
+    else:
+        logic = GameLogic(size=args.size, four_probability=args.four_probability)
+    window = MainWindow(logic, canvas=args.canvas, record_dir=args.record, animate=not args.no_animation)
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    code = app.exec()
+    if args.latency:
+        stats = window.game_view.latency_stats()
+        if stats["samples"]:
+            print(f"Задержка ввод-отрисовка: медиана {stats['p50']:.1f} мс, p95 {stats['p95']:.1f} мс, "
+                  f"максимум {stats['max']:.1f} мс ({stats['samples']} ходов)", file=sys.stderr)
+    sys.exit(code)
\ No newline at end of file
@@ -0,0 +1,222 @@
+"""
+Поиск лучшего хода 2048 методом expectimax.
+
+Поиск работает с битовым представлением поля (см. bitboard_2048): узлы выбора
+хода чередуются с узлами случая, в которых усредняется появление новой плитки.
+Чтобы укладываться во время на ход:
+- оценки узлов случая хранятся в ограниченной LRU-таблице транспозиций,
+  ключ - само 64-битное поле и глубина;
+- глубина растёт по мере уменьшения числа пустых клеток, а поиск
+  углубляется итеративно, пока не кончится бюджет времени.
+"""
+import time
+from collections import OrderedDict
+
+from .bitboard_2048 import apply_rows, transpose
+from .game_logic_2048 import DIRECTIONS
+from .row_tables_2048 import CELL_MASK, ROW_MASK, ROW_STATES, SIZE, get_tables
+
+# Веса эвристики оценки строки
+LOST_PENALTY = 200000.0
+MONOTONICITY_POWER = 4.0
+MONOTONICITY_WEIGHT = 47.0
+SUM_POWER = 3.5
+SUM_WEIGHT = 11.0
+MERGES_WEIGHT = 700.0
+EMPTY_WEIGHT = 270.0
+
+# Ветви с вероятностью меньше порога не раскрываются
+PROBABILITY_CUTOFF = 1e-4
+# Как часто (в узлах) проверяются время и запрос отмены
+CHECK_INTERVAL = 512
+
+_ROW_HEURISTIC = [None] * ROW_STATES
+
+
+class SearchCancelled(Exception):
+    """Поиск прерван: закончилось время или пришёл запрос отмены."""
+
+
+def row_heuristic(row):
+    """Оценка одной строки: пустые клетки, возможные объединения, монотонность, сумма."""
+    value = _ROW_HEURISTIC[row]
+    if value is not None:
+        return value
+    ranks = [(row >> (4 * j)) & CELL_MASK for j in range(SIZE)]
+    total = empty = merges = 0.0
+    prev = counter = 0
+    for rank in ranks:
+        total += rank ** SUM_POWER
+        if rank == 0:
+            empty += 1
+        else:
+            if prev == rank:
+                counter += 1
+            elif counter > 0:
+                merges += 1 + counter
+                counter = 0
+            prev = rank
+    if counter > 0:
+        merges += 1 + counter
+    mono_left = mono_right = 0.0
+    for a, b in zip(ranks, ranks[1:]):
+        if a > b:
+            mono_left += a ** MONOTONICITY_POWER - b ** MONOTONICITY_POWER
+        else:
+            mono_right += b ** MONOTONICITY_POWER - a ** MONOTONICITY_POWER
+    value = (LOST_PENALTY + EMPTY_WEIGHT * empty + MERGES_WEIGHT * merges
+             - MONOTONICITY_WEIGHT * min(mono_left, mono_right) - SUM_WEIGHT * total)
+    _ROW_HEURISTIC[row] = value
+    return value
+
+
+def evaluate(bits):
+    """Оценка поля: сумма оценок строк и столбцов."""
+    columns = transpose(bits)
+    return (row_heuristic(bits & ROW_MASK) + row_heuristic((bits >> 16) & ROW_MASK)
+            + row_heuristic((bits >> 32) & ROW_MASK) + row_heuristic(bits >> 48)
+            + row_heuristic(columns & ROW_MASK) + row_heuristic((columns >> 16) & ROW_MASK)
+            + row_heuristic((columns >> 32) & ROW_MASK) + row_heuristic(columns >> 48))
+
+
+def empty_cells(bits):
+    return [k for k in range(SIZE * SIZE) if not (bits >> (4 * k)) & CELL_MASK]
+
+
+class LRUCache:
+    """Словарь ограниченного размера: при переполнении вытесняется самая старая запись."""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self.data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.data.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self.data[key] = value
+        self.data.move_to_end(key)
+        if len(self.data) > self.max_size:
+            self.data.popitem(last=False)
+
+    def __len__(self):
+        return len(self.data)
+
+
+class ExpectimaxSolver:
+    """
+    Поиск хода для поля 4x4.
+
+    Один экземпляр можно использовать для многих ходов подряд: таблица
+    транспозиций переиспользуется между вызовами choose.
+    """
+
+    def __init__(self, time_budget=0.2, max_depth=4, table_size=200000, four_probability=0.0):
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.four_probability = four_probability
+        self.table = LRUCache(table_size)
+        self._row_left, self._row_right, self._score_left, self._score_right = get_tables()
+        self._deadline = None
+        self._should_stop = None
+        self._nodes = 0
+        self.last_depth = 0
+
+    def depth_for(self, bits):
+        """Чем меньше пустых клеток, тем меньше ветвление и тем глубже можно искать."""
+        empty = len(empty_cells(bits))
+        if empty >= 8:
+            depth = 2
+        elif empty >= 4:
+            depth = 3
+        else:
+            depth = 4
+        return min(depth, self.max_depth)
+
+    def moves(self, bits):
+        """Все ходы, которые меняют поле: список (направление, новое поле)."""
+        result = []
+        columns = None
+        for direction in DIRECTIONS:
+            if direction == 'left':
+                new_bits, _ = apply_rows(bits, self._row_left, self._score_left)
+            elif direction == 'right':
+                new_bits, _ = apply_rows(bits, self._row_right, self._score_right)
+            else:
+                columns = transpose(bits) if columns is None else columns
+                table = self._row_left if direction == 'up' else self._row_right
+                new_bits = transpose(apply_rows(columns, table, self._score_left)[0])
+            if new_bits != bits:
+                result.append((direction, new_bits))
+        return result
+
+    def _tick(self):
+        self._nodes += 1
+        if self._nodes % CHECK_INTERVAL == 0:
+            if self._should_stop is not None and self._should_stop():
+                raise SearchCancelled()
+            if self._deadline is not None and time.perf_counter() > self._deadline:
+                raise SearchCancelled()
+
+    def _max_node(self, bits, depth, probability):
+        self._tick()
+        best_direction, best_value = None, 0.0
+        for direction, new_bits in self.moves(bits):
+            value = self._chance_node(new_bits, depth, probability)
+            if best_direction is None or value > best_value:
+                best_direction, best_value = direction, value
+        return best_direction, best_value
+
+    def _chance_node(self, bits, depth, probability):
+        if depth <= 0 or probability < PROBABILITY_CUTOFF:
+            return evaluate(bits)
+        key = (bits << 4) | depth
+        cached = self.table.get(key)
+        if cached is not None:
+            return cached
+        empty = empty_cells(bits)
+        if not empty:
+            return evaluate(bits)
+        p_two = (1.0 - self.four_probability) / len(empty)
+        p_four = self.four_probability / len(empty)
+        total = 0.0
+        for k in empty:
+            total += p_two * self._max_node(bits | (1 << (4 * k)), depth - 1, probability * p_two)[1]
+            if p_four:
+                total += p_four * self._max_node(bits | (2 << (4 * k)), depth - 1, probability * p_four)[1]
+        self.table.put(key, total)
+        return total
+
+    def choose(self, bits, should_stop=None):
+        """
+        Лучший ход для поля bits или None, если ходов нет.
+
+        Глубина увеличивается, пока хватает времени; если поиск прерван,
+        возвращается результат последней завершённой итерации.
+        should_stop() вызывается периодически; True прерывает поиск.
+        """
+        self._should_stop = should_stop
+        self._deadline = time.perf_counter() + self.time_budget if self.time_budget else None
+        self._nodes = 0
+        moves = self.moves(bits)
+        if not moves:
+            return None
+        best = moves[0][0]
+        self.last_depth = 0
+        try:
+            for depth in range(1, self.depth_for(bits) + 1):
+                direction, _ = self._max_node(bits, depth, 1.0)
+                best = direction
+                self.last_depth = depth
+        except SearchCancelled:
+            if should_stop is not None and should_stop():
+                return None
+        return best
@@ -0,0 +1,291 @@
+"""
+Логика игры 2048 без зависимости от Qt.
+
+Модуль используется графическим интерфейсом (exam_game_2048) и консольными
+утилитами (например, exam.selfplay).
+"""
+from operator import eq
+
+from .rng_2048 import as_rng
+
+
+MIN_SIZE = 3
+MAX_SIZE = 16
+# Предел числа запомненных линий (на поле 4x4 в партии встречается несколько тысяч разных строк)
+LINE_CACHE_SIZE = 1 << 18
+# Направления хода; порядок задаёт коды ходов в записях партий (replay_2048)
+DIRECTIONS = ('left', 'right', 'up', 'down')
+
+# Кортеж линии -> (линия после сдвига к началу, очки, число плиток); общий для всех GameLogic
+_lines = {}
+
+
+def merge_line(line):
+    """
+    Сдвиг линии (кортежа значений или None) к её началу с объединением пар.
+
+    Результат запоминается: ключ - сама линия, поэтому, в отличие от таблиц
+    row_tables_2048, строку не нужно упаковывать в число и распаковывать
+    обратно, и подходят линии любой длины с любыми плитками.
+
+    :return: (линия после хода - кортеж, очки, число плиток)
+    """
+    entry = _lines.get(line)
+    if entry is not None:
+        return entry
+    temp = [val for val in line if val is not None]
+    result = []
+    score = 0
+    i = 0
+    while i < len(temp):
+        if i + 1 < len(temp) and temp[i] == temp[i + 1]:
+            result.append(temp[i] * 2)
+            score += temp[i] * 2
+            i += 2
+        else:
+            result.append(temp[i])
+            i += 1
+    entry = (tuple(result) + (None,) * (len(line) - len(result)), score, len(result))
+    if len(_lines) >= LINE_CACHE_SIZE:
+        _lines.clear()
+    _lines[line] = entry
+    return entry
+
+
+def any_pair(lines):
+    """
+    Есть ли пара равных соседних плиток в линиях после хода.
+
+    lines - список (значения, число плиток) в порядке обхода. После хода плитки
+    каждой линии прижаты к её началу: значения в line[:filled], дальше None.
+    """
+    prev = prev_filled = None
+    for line, filled in lines:
+        if any(map(eq, line[:filled - 1], line[1:filled])):
+            return True
+        if prev is not None:
+            common = min(filled, prev_filled)
+            if any(map(eq, line[:common], prev[:common])):
+                return True
+        prev, prev_filled = line, filled
+    return False
+
+
+def move_transitions(board, direction):
+    """
+    Куда переезжают плитки поля board при ходе direction (для анимации).
+
+    Объединения те же, что в GameLogic.merge_row: пары складываются от края,
+    к которому идёт ход.
+
+    :return: список (i, j, new_i, new_j, value, merged) для каждой плитки поля
+             до хода; merged - плитка объединилась с соседней в (new_i, new_j)
+    """
+    n = len(board)
+    transitions = []
+    for line in range(n):
+        # Клетки линии начиная с края, к которому сдвигаются плитки
+        if direction == 'left':
+            cells = [(line, k) for k in range(n)]
+        elif direction == 'right':
+            cells = [(line, n - 1 - k) for k in range(n)]
+        elif direction == 'up':
+            cells = [(k, line) for k in range(n)]
+        elif direction == 'down':
+            cells = [(n - 1 - k, line) for k in range(n)]
+        else:
+            raise ValueError(f"Неизвестное направление хода: {direction}")
+        tiles = [(i, j, board[i][j]) for i, j in cells if board[i][j] is not None]
+        target = k = 0
+        while k < len(tiles):
+            new_i, new_j = cells[target]
+            i, j, value = tiles[k]
+            if k + 1 < len(tiles) and tiles[k + 1][2] == value:
+                transitions.append((i, j, new_i, new_j, value, True))
+                transitions.append((tiles[k + 1][0], tiles[k + 1][1], new_i, new_j, value, True))
+                k += 2
+            else:
+                transitions.append((i, j, new_i, new_j, value, False))
+                k += 1
+            target += 1
+    return transitions
+
+
+class GameLogic:
+    def __init__(self, rng=None, size=4, four_probability=0.0):
+        if not MIN_SIZE <= size <= MAX_SIZE:
+            raise ValueError(f"Размер поля должен быть от {MIN_SIZE} до {MAX_SIZE}: {size}")
+        if not 0.0 <= four_probability <= 1.0:
+            raise ValueError(f"Вероятность плитки 4 должна быть от 0 до 1: {four_probability}")
+        self.size = size
+        # Маска пустых клеток (бит i * size + j) и признак пары равных соседних плиток.
+        # Обновляются во время хода и появления плитки, поэтому place_new_tile и can_move
+        # не просматривают поле. При присваивании board пересчитываются целиком.
+        # Пока на поле есть пустые клетки, признак пар can_move не нужен и может
+        # быть не вычислен (None).
+        self._empty_mask = 0
+        self._empty_count = 0
+        self._has_pair = None
+        # Маски "каждая size-я клетка" для столбцов: _stride[c] - c клеток столбца подряд
+        self._stride = [sum(1 << (i * size) for i in range(c)) for c in range(size + 1)]
+        self.board = [[None for _ in range(size)] for _ in range(size)]
+        self.score = 0
+        # Источник случайности для новых плиток: random.Random, SplitMix64, генератор NumPy
+        # или целое зерно (см. rng_2048.as_rng)
+        self.rng = as_rng(rng)
+        # Вероятность того, что новая плитка - 4 (в классической игре 0.1)
+        self.four_probability = four_probability
+
+    def reset(self):
+        self.board = [[None for _ in range(self.size)] for _ in range(self.size)]
+        self.score = 0
+
+    @property
+    def board(self):
+        return self._board
+
+    @board.setter
+    def board(self, board):
+        self._board = board
+        self._rescan()
+
+    def _rescan(self):
+        """Полный пересчёт маски пустых клеток и признака пар (после замены поля целиком)."""
+        board, n = self._board, self.size
+        self._empty_mask = sum(1 << (i * n + j) for i in range(n) for j in range(n) if board[i][j] is None)
+        self._empty_count = self._empty_mask.bit_count()
+        self._has_pair = self._scan_pairs()
+
+    def _scan_pairs(self):
+        """Есть ли на поле пара равных соседних плиток (просмотр всего поля)."""
+        board, n = self._board, self.size
+        return any(
+            board[i][j] is not None and (
+                (i > 0 and board[i][j] == board[i - 1][j]) or (j > 0 and board[i][j] == board[i][j - 1]))
+            for i in range(n) for j in range(n))
+
+    def empty_cells(self):
+        """Пустые клетки (i, j) построчно."""
+        n, mask = self.size, self._empty_mask
+        cells = []
+        while mask:
+            low = mask & -mask
+            cells.append(divmod(low.bit_length() - 1, n))
+            mask ^= low
+        return cells
+
+    def place_new_tile(self):
+        """
+        Новая плитка на случайной пустой клетке: 4 с вероятностью four_probability, иначе 2.
+
+        Сначала выбирается клетка, затем (только при four_probability > 0) значение.
+
+        :return: позиция (i, j) новой плитки или None, если поле заполнено
+        """
+        if not self._empty_count:
+            return None
+        # k-я по порядку (построчно) пустая клетка - тот же выбор, что choice из списка пустых клеток
+        mask = self._empty_mask
+        for _ in range(self.rng.randrange(self._empty_count)):
+            mask &= mask - 1
+        i, j = divmod((mask & -mask).bit_length() - 1, self.size)
+        self.place_tile(i, j, 4 if self.four_probability and self.rng.random() < self.four_probability else 2)
+        return i, j
+
+    def place_tile(self, i, j, value):
+        """Плитка value на пустой клетке (i, j), например при проигрывании записи партии."""
+        n = self.size
+        bit = 1 << (i * n + j)
+        if not self._empty_mask & bit:
+            raise ValueError(f"Клетка ({i}, {j}) занята")
+        board = self._board
+        board[i][j] = value
+        self._empty_mask ^= bit
+        self._empty_count -= 1
+        if self._has_pair is False:
+            self._has_pair = ((i > 0 and board[i - 1][j] == value) or (i + 1 < n and board[i + 1][j] == value)
+                              or (j > 0 and board[i][j - 1] == value) or (j + 1 < n and board[i][j + 1] == value))
+
+    def merge_row(self, row):
+        merged, score, _ = merge_line(tuple(row))
+        self.score += score
+        return list(merged)
+
+    def move(self, direction):
+        """
+        Ход в направлении 'left', 'right', 'up' или 'down'.
+
+        Строки и столбцы обрабатываются на месте, без поворотов всего поля.
+        В том же проходе по линиям обновляются маска пустых клеток и признак пар.
+
+        :return: True, если поле изменилось
+        """
+        board = self._board
+        n = self.size
+        changed = False
+        score = empty_mask = 0
+        lines = []  # Линии после хода в порядке обхода: (значения, число плиток)
+        if direction == 'left' or direction == 'right':
+            left = direction == 'left'
+            for i in range(n):
+                line = tuple(board[i]) if left else tuple(board[i][::-1])
+                merged, gained, filled = merge_line(line)
+                if merged != line:
+                    changed = True
+                    score += gained
+                    board[i] = list(merged) if left else list(merged[::-1])
+                # После хода пустые клетки собраны у дальнего от направления края линии
+                if filled < n:
+                    line_mask = (1 << (n - filled)) - 1
+                    empty_mask |= (line_mask << filled if left else line_mask) << (i * n)
+                lines.append((merged, filled))
+        elif direction == 'up' or direction == 'down':
+            rows = range(n) if direction == 'up' else range(n - 1, -1, -1)
+            for j in range(n):
+                line = tuple([board[i][j] for i in rows])
+                merged, gained, filled = merge_line(line)
+                if merged != line:
+                    changed = True
+                    score += gained
+                    for i, val in zip(rows, merged):
+                        board[i][j] = val
+                if filled < n:
+                    first_empty_row = filled if direction == 'up' else 0
+                    empty_mask |= self._stride[n - filled] << (first_empty_row * n + j)
+                lines.append((merged, filled))
+        else:
+            raise ValueError(f"Неизвестное направление хода: {direction}")
+        self.score += score
+        empty_count = empty_mask.bit_count()
+        self._empty_mask, self._empty_count = empty_mask, empty_count
+        # Пары нужны, только если после хода и новой плитки поле может оказаться заполненным
+        self._has_pair = any_pair(lines) if empty_count <= 1 else None
+        return changed
+
+    def move_left(self):
+        return self.move('left')
+
+    def copy(self):
+        """Независимая копия поля и счёта (генератор случайных чисел общий)."""
+        clone = GameLogic(self.rng, self.size, self.four_probability)
+        clone._board = [row[:] for row in self._board]
+        clone._empty_mask, clone._empty_count, clone._has_pair = self._empty_mask, self._empty_count, self._has_pair
+        clone.score = self.score
+        return clone
+
+    def rotate(self):
+        n = len(self.board)
+        rotated = [[None] * n for _ in range(n)]
+        for i in range(n):
+            for j in range(n):
+                rotated[j][n - 1 - i] = self.board[i][j]
+        self.board = rotated
+
+    def can_move(self):
+        """Ход возможен, если есть пустая клетка или пара равных соседних плиток."""
+        if self._empty_count:
+            return True
+        if self._has_pair is None:
+            # Признак не вычислялся: после хода было больше одной пустой клетки, их заняли place_tile
+            self._has_pair = self._scan_pairs()
+        return self._has_pair
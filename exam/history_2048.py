@@ -0,0 +1,62 @@
+"""
+История ходов 2048 для отмены и повтора.
+
+Состояния хранятся не копиями списков, а подряд в одном bytearray в формате
+опорного кадра записи партии (см. replay_2048): счёт и по байту на клетку.
+На поле 4x4 это 24 байта на ход, любое состояние читается по смещению за O(1).
+"""
+from .replay_2048 import SCORE, decode_board, encode_board
+
+
+class History:
+    """
+    Линейная история состояний с текущей позицией.
+
+    push после undo отбрасывает отменённые состояния, как в текстовых редакторах.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.entry_size = SCORE.size + size * size
+        self.data = bytearray()
+        self.position = -1  # Номер текущего состояния (-1 - история пуста)
+
+    def __len__(self):
+        return len(self.data) // self.entry_size
+
+    def clear(self):
+        self.data.clear()
+        self.position = -1
+
+    def push(self, board, score):
+        """Новое состояние после текущего."""
+        del self.data[(self.position + 1) * self.entry_size:]
+        self.data += encode_board(board, score)
+        self.position += 1
+
+    def state(self, index):
+        """Поле и счёт состояния с номером index."""
+        if not 0 <= index < len(self):
+            raise IndexError(f"Нет состояния с номером {index}")
+        start = index * self.entry_size
+        return decode_board(memoryview(self.data)[start:start + self.entry_size], self.size)
+
+    def jump(self, index):
+        """Переход к состоянию index: (поле, счёт)."""
+        board, score = self.state(index)
+        self.position = index
+        return board, score
+
+    def can_undo(self):
+        return self.position > 0
+
+    def can_redo(self):
+        return self.position + 1 < len(self)
+
+    def undo(self):
+        """Предыдущее состояние или None, если отменять нечего."""
+        return self.jump(self.position - 1) if self.can_undo() else None
+
+    def redo(self):
+        """Следующее состояние или None, если повторять нечего."""
+        return self.jump(self.position + 1) if self.can_redo() else None
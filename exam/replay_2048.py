@@ -0,0 +1,198 @@
+"""
+Компактная двоичная запись партий 2048.
+
+Формат файла (все числа little-endian):
+- заголовок HEADER: сигнатура b"2048", версия, размер поля N, интервал
+  опорных кадров K и зерно генератора, которым создавались новые плитки
+  (0 - неизвестно);
+- опорный кадр 0 - начальное поле;
+- записи ходов фиксированной длины, после каждых K ходов - опорный кадр.
+
+Опорный кадр: счёт (8 байт) и N * N байт показателей степени двойки
+построчно (0 - пустая клетка). Запись хода: направление (2 бита), признак
+новой плитки, признак плитки 4 и номер клетки новой плитки i * N + j.
+Для полей до 4x4 это ровно один байт, для больших - два.
+
+Длины записей и кадров постоянны, поэтому смещение любого хода и ближайшего
+опорного кадра вычисляется арифметически: чтобы получить поле после хода m,
+достаточно прочитать кадр m // K и доиграть не больше K - 1 ходов.
+"""
+import struct
+
+from .game_logic_2048 import DIRECTIONS, GameLogic
+
+MAGIC = b"2048"
+VERSION = 1
+HEADER = struct.Struct("<4sBBHQ")  # Сигнатура, версия, N, K, зерно
+SCORE = struct.Struct("<Q")
+DEFAULT_KEYFRAME_INTERVAL = 256
+
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+# Биты записи хода над номером клетки
+SPAWN_FLAG = 1
+FOUR_FLAG = 2
+
+
+def record_size(size):
+    """Длина записи хода: один байт, если номер клетки помещается в 4 бита."""
+    return 1 if size * size <= 16 else 2
+
+
+def position_bits(size):
+    return 4 if size * size <= 16 else 8
+
+
+def encode_board(board, score):
+    """Опорный кадр: счёт и показатели степени двойки всех клеток построчно."""
+    return SCORE.pack(score) + bytes(val.bit_length() - 1 if val else 0 for row in board for val in row)
+
+
+def decode_board(data, size):
+    """Поле и счёт из опорного кадра."""
+    score, = SCORE.unpack_from(data)
+    cells = data[SCORE.size:SCORE.size + size * size]
+    board = [[1 << e if e else None for e in cells[i * size:(i + 1) * size]] for i in range(size)]
+    return board, score
+
+
+class ReplayWriter:
+    """
+    Запись партии в двоичный поток.
+
+    Заголовок и начальное поле logic пишутся сразу; после каждого хода
+    вызывается record. Опорные кадры снимаются с того же объекта logic.
+    """
+
+    def __init__(self, stream, logic, seed=0, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL):
+        if not 1 <= keyframe_interval <= 0xFFFF:
+            raise ValueError(f"Интервал опорных кадров должен быть от 1 до 65535: {keyframe_interval}")
+        self.stream = stream
+        self.logic = logic
+        self.size = logic.size
+        self.keyframe_interval = keyframe_interval
+        self.moves = 0
+        self._shift = position_bits(self.size)
+        self._record_size = record_size(self.size)
+        stream.write(HEADER.pack(MAGIC, VERSION, self.size, keyframe_interval, seed & ((1 << 64) - 1)))
+        stream.write(encode_board(logic.board, logic.score))
+
+    def record(self, direction, spawn=None):
+        """
+        Запись хода direction и появившейся после него плитки.
+
+        :param spawn: (i, j, значение) новой плитки (2 или 4) или None
+        """
+        code = DIRECTION_CODES[direction] << 2
+        position = 0
+        if spawn is not None:
+            i, j, value = spawn
+            if value not in (2, 4):
+                raise ValueError(f"Новая плитка может быть только 2 или 4: {value}")
+            code |= SPAWN_FLAG | (FOUR_FLAG if value == 4 else 0)
+            position = i * self.size + j
+        self.stream.write(((code << self._shift) | position).to_bytes(self._record_size, "little"))
+        self.moves += 1
+        if self.moves % self.keyframe_interval == 0:
+            self.stream.write(encode_board(self.logic.board, self.logic.score))
+
+    def flush(self):
+        self.stream.flush()
+
+    def close(self):
+        self.stream.close()
+
+
+class ReplayReader:
+    """
+    Чтение записи партии из байтов (например, содержимого файла или mmap).
+
+    state_at(m) восстанавливает поле после m ходов от ближайшего опорного кадра,
+    states() проигрывает всю партию через GameLogic.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        magic, version, self.size, self.keyframe_interval, self.seed = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Это не запись партии 2048")
+        if version != VERSION:
+            raise ValueError(f"Неподдерживаемая версия записи: {version}")
+        self._shift = position_bits(self.size)
+        self._position_mask = (1 << self._shift) - 1
+        self._record_size = record_size(self.size)
+        self._keyframe_size = SCORE.size + self.size * self.size
+        # Блок: опорный кадр и K ходов после него
+        self._block_size = self._keyframe_size + self.keyframe_interval * self._record_size
+        # Число ходов и целых опорных кадров по длине данных; недописанная последняя
+        # запись не считается, а ходы перед недописанным кадром доигрываются от предыдущего
+        blocks, rest = divmod(len(data) - HEADER.size, self._block_size)
+        self.moves = blocks * self.keyframe_interval
+        self._keyframes = blocks
+        if rest >= self._keyframe_size:
+            self.moves += (rest - self._keyframe_size) // self._record_size
+            self._keyframes += 1
+        if not self._keyframes:
+            raise ValueError("Запись обрезана: нет начального поля")
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, "rb") as file:
+            return cls(file.read())
+
+    def __len__(self):
+        return self.moves
+
+    def _record_offset(self, index):
+        return HEADER.size + (index // self.keyframe_interval + 1) * self._keyframe_size + index * self._record_size
+
+    def record(self, index):
+        """
+        Ход с номером index.
+
+        :return: (направление, (i, j, значение) новой плитки или None)
+        """
+        if not 0 <= index < self.moves:
+            raise IndexError(f"Нет хода с номером {index}")
+        offset = self._record_offset(index)
+        word = int.from_bytes(self.data[offset:offset + self._record_size], "little")
+        code = word >> self._shift
+        spawn = None
+        if code & SPAWN_FLAG:
+            i, j = divmod(word & self._position_mask, self.size)
+            spawn = (i, j, 4 if code & FOUR_FLAG else 2)
+        return DIRECTIONS[code >> 2], spawn
+
+    def keyframe(self, k):
+        """Поле и счёт после k * K ходов."""
+        offset = HEADER.size + k * self._block_size
+        return decode_board(self.data[offset:offset + self._keyframe_size], self.size)
+
+    def state_at(self, index):
+        """GameLogic с полем и счётом после index ходов (0 - начальное поле)."""
+        if not 0 <= index <= self.moves:
+            raise IndexError(f"Нет хода с номером {index}")
+        k = min(index // self.keyframe_interval, self._keyframes - 1)
+        logic = GameLogic(size=self.size)
+        logic.board, logic.score = self.keyframe(k)
+        for m in range(k * self.keyframe_interval, index):
+            self._apply(logic, self.record(m))
+        return logic
+
+    def states(self, start=0):
+        """
+        Проигрывание партии с хода start: после каждого хода выдаётся
+        (номер хода, направление, логика). Логика - один и тот же объект.
+        """
+        logic = self.state_at(start)
+        for m in range(start, self.moves):
+            move = self.record(m)
+            self._apply(logic, move)
+            yield m, move[0], logic
+
+    @staticmethod
+    def _apply(logic, move):
+        direction, spawn = move
+        logic.move(direction)
+        if spawn is not None:
+            logic.place_tile(*spawn)
@@ -0,0 +1,81 @@
+"""
+Генератор случайных чисел SplitMix64 для логики 2048.
+
+Состояние генератора - одно 64-битное число, следующее значение получается
+несколькими умножениями и сдвигами. Тот же алгоритм легко векторизуется
+в NumPy (см. batch_2048), поэтому одиночная игра и пакетная симуляция
+с одинаковыми зёрнами дают одинаковые последовательности плиток.
+
+Логика игры принимает любой генератор с методами randrange, choice и random
+(например, random.Random или SplitMix64); as_rng приводит к такому виду
+генератор NumPy и целое зерно.
+"""
+import random as _random
+
+MASK64 = (1 << 64) - 1
+GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+MIX1 = 0xBF58476D1CE4E5B9
+MIX2 = 0x94D049BB133111EB
+
+
+class SplitMix64:
+    """
+    Быстрый генератор со счётчиком в качестве состояния.
+
+    Поддерживает методы random.Random, которые используются логикой игры:
+    randrange(n), choice(seq) и random().
+    """
+
+    def __init__(self, seed=0):
+        self.state = seed & MASK64
+
+    def next_u64(self):
+        self.state = (self.state + GOLDEN_GAMMA) & MASK64
+        z = self.state
+        z = ((z ^ (z >> 30)) * MIX1) & MASK64
+        z = ((z ^ (z >> 27)) * MIX2) & MASK64
+        return z ^ (z >> 31)
+
+    def randrange(self, n):
+        """Целое число из [0, n): старшие 32 бита, умноженные на n (n < 2 ** 32)."""
+        return ((self.next_u64() >> 32) * n) >> 32
+
+    def choice(self, seq):
+        return seq[self.randrange(len(seq))]
+
+    def random(self):
+        """Число с плавающей точкой из [0, 1)."""
+        return (self.next_u64() >> 11) * (1.0 / (1 << 53))
+
+
+class NumpyRandom:
+    """Генератор numpy.random.Generator с методами random.Random, которые нужны логике игры."""
+
+    def __init__(self, generator):
+        self.generator = generator
+
+    def randrange(self, n):
+        return int(self.generator.integers(n))
+
+    def choice(self, seq):
+        return seq[self.randrange(len(seq))]
+
+    def random(self):
+        return float(self.generator.random())
+
+
+def as_rng(rng):
+    """
+    Генератор для логики игры.
+
+    None - собственный random.Random со случайным зерном (у каждой партии своё
+    состояние), целое число - SplitMix64 с этим зерном, numpy.random.Generator
+    оборачивается в NumpyRandom, остальное возвращается как есть.
+    """
+    if rng is None:
+        return _random.Random()
+    if isinstance(rng, int):
+        return SplitMix64(rng)
+    if not hasattr(rng, 'randrange') and hasattr(rng, 'integers'):
+        return NumpyRandom(rng)
+    return rng
@@ -0,0 +1,133 @@
+"""
+Таблицы ходов для одной строки поля 4x4.
+
+Строка из 4 клеток с показателями степени 0..15 кодируется 16-битным числом
+(левая клетка - младшие 4 бита), поэтому всех состояний строки всего 65536.
+Для каждого состояния заранее вычисляются результат сдвига влево/вправо
+и прирост счёта. Таблицы строятся один раз и кэшируются в файл,
+так что при следующих запусках загрузка занимает миллисекунды.
+"""
+import os
+import sys
+from array import array
+
+SIZE = 4
+ROW_MASK = 0xFFFF
+CELL_MASK = 0xF
+# Максимальный показатель, который помещается в 4 бита (2 ** 15 = 32768)
+MAX_EXPONENT = 15
+ROW_STATES = 1 << 16
+CACHE_VERSION = 1
+
+# Значение плитки по показателю и обратное соответствие (0 - пустая клетка)
+VALUES = [None] + [1 << e for e in range(1, MAX_EXPONENT + 1)]
+# Плитки 32768 через таблицу не кодируются: таблица не объединяет их (см. move_row_left)
+EXPONENTS = {v: e for e, v in enumerate(VALUES) if e < MAX_EXPONENT}
+
+ROW_LEFT = ROW_RIGHT = ROW_SCORE_LEFT = ROW_SCORE_RIGHT = None
+
+
+def move_row_left(row):
+    """
+    Сдвиг одной 16-битной строки влево с объединением плиток.
+
+    :return: кортеж (новая строка, прирост счёта)
+    """
+    cells = [(row >> (4 * j)) & CELL_MASK for j in range(SIZE)]
+    temp = [e for e in cells if e]
+    result = []
+    gained = 0
+    i = 0
+    while i < len(temp):
+        # Две плитки 32768 не объединяются: результат не помещается в 4 бита
+        if i + 1 < len(temp) and temp[i] == temp[i + 1] and temp[i] < MAX_EXPONENT:
+            result.append(temp[i] + 1)
+            gained += 1 << (temp[i] + 1)
+            i += 2
+        else:
+            result.append(temp[i])
+            i += 1
+    new_row = 0
+    for j, e in enumerate(result):
+        new_row |= e << (4 * j)
+    return new_row, gained
+
+
+def reverse_row(row):
+    """Зеркальное отражение 16-битной строки."""
+    return ((row & 0xF) << 12) | ((row & 0xF0) << 4) | ((row >> 4) & 0xF0) | (row >> 12)
+
+
+def encode_row(row):
+    """
+    Кодирование строки из 4 значений None/int в 16-битный ключ таблицы.
+
+    :return: ключ или None, если значение не помещается в таблицу
+    """
+    try:
+        return EXPONENTS[row[0]] | EXPONENTS[row[1]] << 4 | EXPONENTS[row[2]] << 8 | EXPONENTS[row[3]] << 12
+    except KeyError:
+        return None
+
+
+def decode_row(row):
+    """Обратное преобразование 16-битной строки в список None/int."""
+    return [VALUES[row & CELL_MASK], VALUES[(row >> 4) & CELL_MASK],
+            VALUES[(row >> 8) & CELL_MASK], VALUES[row >> 12]]
+
+
+def cache_path():
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_dir, "exam_2048", f"row_tables_v{CACHE_VERSION}_{sys.byteorder}.bin")
+
+
+def build_tables():
+    """Вычисление таблиц перебором всех состояний строки."""
+    left = array("H", bytes(2 * ROW_STATES))
+    right = array("H", bytes(2 * ROW_STATES))
+    score_left = array("I", bytes(4 * ROW_STATES))
+    score_right = array("I", bytes(4 * ROW_STATES))
+    for row in range(ROW_STATES):
+        left[row], score_left[row] = move_row_left(row)
+        rev_row, score_right[row] = move_row_left(reverse_row(row))
+        right[row] = reverse_row(rev_row)
+    return left, right, score_left, score_right
+
+
+def load_tables(path):
+    tables = (array("H"), array("H"), array("I"), array("I"))
+    with open(path, "rb") as file:
+        for table in tables:
+            table.fromfile(file, ROW_STATES)
+    return tables
+
+
+def save_tables(path, tables):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Запись во временный файл и переименование, чтобы не оставить недописанный кэш
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as file:
+        for table in tables:
+            table.tofile(file)
+    os.replace(tmp_path, path)
+
+
+def get_tables():
+    """
+    Таблицы (ROW_LEFT, ROW_RIGHT, ROW_SCORE_LEFT, ROW_SCORE_RIGHT).
+
+    При первом вызове таблицы читаются из кэша или строятся и сохраняются в кэш.
+    """
+    global ROW_LEFT, ROW_RIGHT, ROW_SCORE_LEFT, ROW_SCORE_RIGHT
+    if ROW_LEFT is None:
+        path = cache_path()
+        try:
+            tables = load_tables(path)
+        except (OSError, EOFError):
+            tables = build_tables()
+            try:
+                save_tables(path, tables)
+            except OSError:
+                pass
+        ROW_LEFT, ROW_RIGHT, ROW_SCORE_LEFT, ROW_SCORE_RIGHT = tables
+    return ROW_LEFT, ROW_RIGHT, ROW_SCORE_LEFT, ROW_SCORE_RIGHT
@@ -0,0 +1,150 @@
+"""
+Хранилище результатов партий 2048 в SQLite.
+
+Каждая законченная партия - отдельная строка таблицы results (счёт,
+максимальная плитка, число ходов, длительность, размер поля), история не
+обрезается. Лучшие результаты и процентили считаются запросами по индексу
+(size, score), поэтому не требуют чтения всей таблицы.
+
+База работает в режиме WAL: запись партии - одна короткая транзакция, которая
+не блокирует читателей, а несколько запущенных игр пишут в одну базу, не
+затирая результаты друг друга (в отличие от перезаписи best_scores.json).
+"""
+import json
+import os
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+
+SCHEMA_VERSION = 1
+LEGACY_JSON = "best_scores.json"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    finished_at REAL NOT NULL,
+    size INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    max_tile INTEGER,
+    moves INTEGER,
+    duration REAL
+);
+CREATE INDEX IF NOT EXISTS results_size_score ON results (size, score);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def data_path():
+    """Путь к базе в каталоге данных пользователя (XDG_DATA_HOME, на Windows - APPDATA)."""
+    if sys.platform == "win32" and os.environ.get("APPDATA"):
+        data_dir = os.environ["APPDATA"]
+    else:
+        data_dir = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(data_dir, "exam_2048", "scores.sqlite3")
+
+
+class ScoreStore:
+    """
+    Результаты партий в базе SQLite.
+
+    Соединение нельзя использовать из другого потока: каждому потоку нужен
+    свой ScoreStore на ту же базу.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or data_path()
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # isolation_level=None: транзакции открываются явно (см. _transaction)
+        self.conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # В режиме WAL synchronous=NORMAL не портит базу при сбое, теряется только последняя транзакция
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('schema_version', ?)",
+                          (str(SCHEMA_VERSION),))
+
+    def close(self):
+        self.conn.close()
+
+    def add(self, size, score, max_tile=None, moves=None, duration=None, finished_at=None):
+        """Результат одной партии."""
+        self.add_many([(size, score, max_tile, moves, duration, finished_at)])
+
+    def add_many(self, results):
+        """
+        Несколько результатов одной транзакцией.
+
+        :param results: кортежи (size, score, max_tile, moves, duration, finished_at);
+                        finished_at None - текущее время
+        """
+        now = time.time()
+        rows = [(finished_at or now, size, score, max_tile, moves, duration)
+                for size, score, max_tile, moves, duration, finished_at in results]
+        with self._transaction():
+            self.conn.executemany(
+                "INSERT INTO results (finished_at, size, score, max_tile, moves, duration) VALUES (?, ?, ?, ?, ?, ?)",
+                rows)
+
+    @contextmanager
+    def _transaction(self):
+        """BEGIN IMMEDIATE: блокировка записи берётся сразу, а не при первой вставке."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def count(self, size):
+        return self.conn.execute("SELECT COUNT(*) FROM results WHERE size = ?", (size,)).fetchone()[0]
+
+    def top(self, size, k=5):
+        """k лучших результатов для поля size по убыванию счёта."""
+        rows = self.conn.execute(
+            "SELECT score FROM results WHERE size = ? ORDER BY score DESC LIMIT ?", (size, k)).fetchall()
+        return [score for score, in rows]
+
+    def percentile(self, size, p):
+        """Процентиль счёта методом ближайшего ранга (как selfplay.percentile) или None, если партий нет."""
+        count = self.count(size)
+        if not count:
+            return None
+        rank = max(1, -(-count * p // 100))
+        row = self.conn.execute(
+            "SELECT score FROM results WHERE size = ? ORDER BY score LIMIT 1 OFFSET ?",
+            (size, int(rank) - 1)).fetchone()
+        return row[0]
+
+    def migrate_json(self, path=LEGACY_JSON):
+        """
+        Однократный перенос результатов из старого best_scores.json.
+
+        У старых результатов есть только счёт. Повторный вызов для того же
+        файла ничего не делает.
+
+        :return: число перенесённых результатов
+        """
+        try:
+            with open(path, "r") as file:
+                scores = json.load(file)["scores"]
+        except (FileNotFoundError, ValueError, KeyError, TypeError):
+            return 0
+        # Старый формат - один список результатов для поля 4x4
+        if isinstance(scores, list):
+            scores = {"4": scores}
+        key = f"migrated:{os.path.abspath(path)}"
+        with self._transaction():
+            if self.conn.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+                return 0
+            mtime = os.path.getmtime(path)
+            rows = [(mtime, int(size), int(score)) for size, values in scores.items() for score in values]
+            self.conn.executemany("INSERT INTO results (finished_at, size, score) VALUES (?, ?, ?)", rows)
+            self.conn.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (key, str(len(rows))))
+        return len(rows)
+
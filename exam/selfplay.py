@@ -0,0 +1,195 @@
+"""
+Консольная самоигра 2048 без графического интерфейса.
+
+Играет заданное число партий до конца по выбранной стратегии, распределяя
+партии по процессам, и выводит сводную статистику: процентили счёта,
+гистограмму максимальной плитки и скорость в ходах в секунду на ядро.
+
+Запуск из корня репозитория:
+    python -m exam.selfplay --games 1000 --policy corner --workers 4 --seed 1
+
+У каждой партии свой поток SplitMix64, зерно которого зависит только от
+--seed и номера партии, поэтому результаты не зависят от числа процессов.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .bitboard_2048 import BitboardLogic
+from .game_logic_2048 import DIRECTIONS, GameLogic
+from .rng_2048 import SplitMix64
+
+ENGINES = {'list': GameLogic, 'bitboard': BitboardLogic}
+# Порядок предпочтения ходов для стратегии "угол": плитки собираются в левом нижнем углу
+CORNER_ORDER = ('down', 'left', 'right', 'up')
+POLICY_SEED_SALT = 0x5DEECE66D
+
+
+# ---------- Стратегии ----------
+def random_policy(logic, rng):
+    """Случайный ход из тех, что меняют поле."""
+    directions = list(DIRECTIONS)
+    while directions:
+        direction = directions.pop(rng.randrange(len(directions)))
+        if logic.copy().move(direction):
+            return direction
+    return None
+
+
+def greedy_policy(logic, rng):
+    """Ход с наибольшим приростом счёта (при равенстве - в порядке DIRECTIONS)."""
+    best, best_score = None, -1
+    for direction in DIRECTIONS:
+        clone = logic.copy()
+        if clone.move(direction) and clone.score > best_score:
+            best, best_score = direction, clone.score
+    return best
+
+
+def corner_policy(logic, rng):
+    """Первый ход из CORNER_ORDER, который меняет поле."""
+    for direction in CORNER_ORDER:
+        if logic.copy().move(direction):
+            return direction
+    return None
+
+
+POLICIES = {'random': random_policy, 'greedy': greedy_policy, 'corner': corner_policy}
+
+
+# ---------- Партии ----------
+def game_seed(base_seed, index):
+    """Зерно партии зависит только от общего зерна и номера партии, а не от процесса."""
+    return SplitMix64((base_seed << 32) ^ index).next_u64()
+
+
+def play_game(policy, engine, seed, four_probability=0.0):
+    """
+    Одна партия до конца.
+
+    :return: кортеж (счёт, максимальная плитка, число ходов)
+    """
+    logic = ENGINES[engine](rng=SplitMix64(seed), four_probability=four_probability)
+    # Отдельный поток для случайной стратегии, чтобы не сдвигать поток новых плиток
+    policy_rng = SplitMix64(seed ^ POLICY_SEED_SALT)
+    choose = POLICIES[policy]
+    logic.place_new_tile()
+    logic.place_new_tile()
+    moves = 0
+    while True:
+        direction = choose(logic, policy_rng)
+        if direction is None:
+            break
+        logic.move(direction)
+        logic.place_new_tile()
+        moves += 1
+    max_tile = max(val or 0 for row in logic.board for val in row)
+    return logic.score, max_tile, moves
+
+
+def play_chunk(policy, engine, base_seed, start, stop, four_probability=0.0):
+    """
+    Партии с номерами [start, stop) в одном процессе.
+
+    :return: (результаты партий, процессорное время в секундах)
+    """
+    started = time.process_time()
+    results = [play_game(policy, engine, game_seed(base_seed, index), four_probability)
+               for index in range(start, stop)]
+    return results, time.process_time() - started
+
+
+# ---------- Статистика ----------
+def percentile(sorted_values, p):
+    """Процентиль методом ближайшего ранга."""
+    if not sorted_values:
+        return 0
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(results, cpu_seconds, wall_seconds):
+    scores = sorted(score for score, _, _ in results)
+    total_moves = sum(moves for _, _, moves in results)
+    return {
+        "games": len(results),
+        "moves": total_moves,
+        "score_mean": sum(scores) / len(scores) if scores else 0,
+        "score_percentiles": {f"p{p}": percentile(scores, p) for p in (10, 50, 90, 99, 100)},
+        "max_tile_histogram": dict(sorted(Counter(tile for _, tile, _ in results).items())),
+        "moves_per_sec_per_core": total_moves / cpu_seconds if cpu_seconds else 0,
+        "moves_per_sec_wall": total_moves / wall_seconds if wall_seconds else 0,
+    }
+
+
+def print_summary(stats):
+    print(f"Партий: {stats['games']}, ходов: {stats['moves']}")
+    print(f"Средний счёт: {stats['score_mean']:.1f}")
+    print("Процентили счёта: " + ", ".join(f"{k}={v}" for k, v in stats["score_percentiles"].items()))
+    print("Максимальная плитка:")
+    for tile, count in stats["max_tile_histogram"].items():
+        print(f"  {tile:>6}: {count}")
+    print(f"Ходов в секунду на ядро: {stats['moves_per_sec_per_core']:.0f}")
+    print(f"Ходов в секунду всего: {stats['moves_per_sec_wall']:.0f}")
+
+
+def run(games, policy, engine, workers, seed, chunk_size=None, progress=None, four_probability=0.0):
+    """
+    Самоигра games партий в пуле из workers процессов.
+
+    Результаты приходят по мере готовности пачек партий; progress(done, games)
+    вызывается после каждой пачки.
+    """
+    chunk_size = chunk_size or max(1, min(100, games // (workers * 4) or 1))
+    results = []
+    cpu_seconds = 0.0
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(play_chunk, policy, engine, seed, start, min(start + chunk_size, games),
+                                   four_probability)
+                   for start in range(0, games, chunk_size)]
+        for future in as_completed(futures):
+            chunk_results, chunk_cpu = future.result()
+            results.extend(chunk_results)
+            cpu_seconds += chunk_cpu
+            if progress:
+                progress(len(results), games)
+    return summarize(results, cpu_seconds, time.perf_counter() - started)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Самоигра 2048 без графического интерфейса")
+    parser.add_argument("--games", type=int, default=100, help="число партий")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="corner", help="стратегия")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="bitboard", help="реализация логики")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="число процессов")
+    parser.add_argument("--seed", type=int, default=0, help="общее зерно генератора")
+    parser.add_argument("--four-probability", type=float, default=0.0,
+                        help="вероятность новой плитки 4 (0.1 - как в классической игре)")
+    parser.add_argument("--json", action="store_true", help="вывести статистику в формате JSON")
+    args = parser.parse_args(argv)
+
+    def progress(done, total):
+        print(f"\r{done}/{total}", end="", file=sys.stderr, flush=True)
+
+    if not 0.0 <= args.four_probability <= 1.0:
+        parser.error("вероятность плитки 4 должна быть от 0 до 1")
+    if args.workers < 1:
+        parser.error("число процессов должно быть не меньше 1")
+    if args.games < 0:
+        parser.error("число партий не может быть отрицательным")
+    stats = run(args.games, args.policy, args.engine, args.workers, args.seed, progress=progress,
+                four_probability=args.four_probability)
+    print(file=sys.stderr)
+    if args.json:
+        print(json.dumps(stats, ensure_ascii=False, indent=2))
+    else:
+        print_summary(stats)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,20 @@
+"""
+Общие настройки тестов.
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Запуск из любого каталога: пакет exam лежит в корне репозитория
+sys.path.insert(0, ROOT)
+# Модули PySide_lab_3 импортируют друг друга по имени файла (from a_threads import ...)
+sys.path.append(os.path.join(ROOT, "PySide_lab_3"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication(sys.argv[:1])
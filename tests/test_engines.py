@@ -0,0 +1,47 @@
+"""
+Тесты совпадения движков: GameLogic, BitboardLogic и BatchGameLogic с одними
+и теми же зёрнами SplitMix64 дают одинаковые партии.
+"""
+import random
+
+import pytest
+
+from exam.bitboard_2048 import BitboardLogic
+from exam.game_logic_2048 import DIRECTIONS, GameLogic
+from exam.rng_2048 import SplitMix64
+
+np = pytest.importorskip("numpy")
+from exam.batch_2048 import BatchGameLogic  # noqa: E402
+
+SEEDS = range(64)
+MOVES = 400
+FOUR_PROBABILITY = 0.1
+
+
+def new_game(engine, seed):
+    logic = engine(rng=SplitMix64(seed), four_probability=FOUR_PROBABILITY)
+    logic.reset()
+    logic.place_new_tile()
+    logic.place_new_tile()
+    return logic
+
+
+def test_engines_in_lockstep():
+    batch = BatchGameLogic(list(SEEDS), four_probability=FOUR_PROBABILITY)
+    batch.reset()
+    games = [(new_game(GameLogic, seed), new_game(BitboardLogic, seed)) for seed in SEEDS]
+    directions = random.Random(4).choices(DIRECTIONS, k=MOVES)
+    for direction in directions:
+        changed = batch.step(direction)
+        game_over = batch.game_over()
+        for k, engines in enumerate(games):
+            for logic in engines:
+                moved = logic.move(direction)
+                if moved:
+                    logic.place_new_tile()
+                assert moved == changed[k]
+                assert logic.board == batch.board(k)
+                assert logic.score == batch.score[k]
+                assert (not logic.can_move()) == game_over[k]
+    # Партии должны доходить до конца, иначе проверка game_over ничего не значит
+    assert batch.game_over().any()
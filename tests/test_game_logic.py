@@ -0,0 +1,23 @@
+"""
+Тесты GameLogic: пустые клетки и пары после хода и новых плиток.
+"""
+from exam.game_logic_2048 import GameLogic
+
+
+def test_can_move_after_tiles_fill_board():
+    """После хода с двумя пустыми клетками признак пар не вычислен, их занимают place_tile."""
+    logic = GameLogic(size=3)
+    logic.board = [[2, 4, None], [8, 16, None], [32, 64, 128]]
+    assert not logic.move('left')
+    logic.place_tile(0, 2, 4)
+    logic.place_tile(1, 2, 4)
+    assert logic.can_move()
+
+
+def test_can_move_blocked_after_fill():
+    logic = GameLogic(size=3)
+    logic.board = [[2, 4, None], [8, 16, None], [32, 64, 128]]
+    logic.move('left')
+    logic.place_tile(0, 2, 8)
+    logic.place_tile(1, 2, 4)
+    assert not logic.can_move()
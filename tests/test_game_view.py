@@ -0,0 +1,72 @@
+"""
+Тесты GameView: сохранение результата законченной партии, запись партии, плитки.
+"""
+import pytest
+
+from exam.game_logic_2048 import GameLogic
+from exam.replay_2048 import ReplayReader
+from exam.rng_2048 import SplitMix64
+
+
+@pytest.fixture
+def view(qapp, tmp_path, monkeypatch):
+    from exam import exam_game_2048
+    monkeypatch.setattr(exam_game_2048.QMessageBox, "information", lambda *args: None)
+    view = exam_game_2048.GameView(GameLogic(size=3), scores_path=str(tmp_path / "scores.sqlite3"), animate=False)
+    view.start_game()
+    view.results = []
+    view.score_worker.add_result = lambda *result: view.results.append(result)
+    # Одна пустая клетка: ход вправо или вниз заканчивает игру
+    view.logic.board = [[2, 4, 8], [16, 32, 64], [128, 256, None]]
+    view.history.push(view.logic.board, view.logic.score)
+    yield view
+    view.shutdown()
+
+
+def test_same_end_saved_once(view):
+    assert view.step('right')
+    view.finish_frame()
+    view.undo()
+    view.redo()
+    view.finish_frame()
+    assert len(view.results) == 1
+
+
+def test_other_end_after_undo_saved(view):
+    assert view.step('right')
+    view.finish_frame()
+    view.undo()
+    assert view.step('down')
+    view.finish_frame()
+    assert len(view.results) == 2
+
+
+def test_tile_keeps_qwidget_style(qapp):
+    from exam.exam_game_2048 import Tile
+    tile = Tile()
+    tile.set_value(2)
+    assert tile.style() is not None
+
+
+def test_recording_keeps_injected_rng(qapp, tmp_path):
+    from exam.exam_game_2048 import GameView
+    rng = SplitMix64(5)
+    view = GameView(GameLogic(rng=rng), record_dir=str(tmp_path / "replays"),
+                    scores_path=str(tmp_path / "scores.sqlite3"), animate=False)
+    view.start_game()
+    seed = rng.state
+    board = [row[:] for row in view.logic.board]
+    for direction in ('left', 'right', 'up', 'down'):
+        if view.step(direction):
+            break
+    view.undo()
+    view.undo()  # Возврат к началу: следующий ход начнёт новую запись
+    for direction in ('left', 'right', 'up', 'down'):
+        if view.step(direction):
+            break
+    view.shutdown()
+    assert view.logic.rng is rng
+    paths = sorted((tmp_path / "replays").iterdir())
+    assert len(paths) == 2
+    first = [reader for reader in map(ReplayReader.from_file, paths) if reader.seed == seed]
+    assert len(first) == 1 and first[0].state_at(0).board == board
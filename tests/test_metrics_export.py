@@ -0,0 +1,91 @@
+"""
+Тесты выгрузки показателей: HTTP-точка /metrics и архив отсчётов на диске.
+"""
+import urllib.error
+import urllib.request
+from array import array
+
+import pytest
+
+from collectors import SampleBatch
+from metrics_archive import MetricsArchive
+from prometheus_exporter import CONTENT_TYPE, PrometheusExporter
+
+
+def make_batch(channels, rows, costs=None, details=None):
+    """Пачка из строк (время, значения...)."""
+    return SampleBatch(list(channels), array('d', [value for row in rows for value in row]),
+                       costs or {}, details or {})
+
+
+@pytest.fixture
+def exporter():
+    exporter = PrometheusExporter(port=0).start()
+    yield exporter
+    exporter.close()
+
+
+def get(exporter, path):
+    with urllib.request.urlopen(f"http://127.0.0.1:{exporter.port}{path}", timeout=5) as response:
+        return response.headers["Content-Type"], response.read().decode("utf-8")
+
+
+def test_metrics_before_first_batch(exporter):
+    assert get(exporter, "/metrics") == (CONTENT_TYPE, "")
+
+
+def test_metrics_exposition(exporter):
+    exporter.update(make_batch(("cpu", "ram", "cpu0", "load1"), [(1.0, 5.0, 6.0, 7.0, 0.1), (2.0, 10.0, 20.0, 30.0, 0.5)],
+                               costs={"cpu_ram": 0.25, "total": 0.5},
+                               details={"processes": [(1, 'init "x"', 1.5, 2.0)]}))
+    content_type, text = get(exporter, "/metrics")
+    assert content_type == CONTENT_TYPE
+    lines = text.splitlines()
+    assert "# TYPE system_cpu_percent gauge" in lines
+    # Последний отсчёт пачки
+    assert "system_cpu_percent 10.0" in lines
+    assert "system_memory_percent 20.0" in lines
+    assert 'system_cpu_core_percent{core="0"} 30.0' in lines
+    assert 'system_load_average{period="1m"} 0.5' in lines
+    assert "system_sample_timestamp_seconds 2.0" in lines
+    assert 'system_process_cpu_percent{pid="1",name="init \\"x\\""} 1.5' in lines
+    assert 'system_process_resident_bytes{pid="1",name="init \\"x\\""} 2097152.0' in lines
+    assert 'system_collector_cost_milliseconds{collector="total"} 0.5' in lines
+
+
+def test_unknown_path(exporter):
+    with pytest.raises(urllib.error.HTTPError) as error:
+        get(exporter, "/other")
+    assert error.value.code == 404
+
+
+def test_archive_rotate_and_load(tmp_path):
+    archive = MetricsArchive(str(tmp_path), segment_seconds=10, max_age=20)
+    archive.append(make_batch(("cpu", "ram"), [(1000.0, 1.0, 50.0), (1001.0, 2.0, 51.0)]))
+    # Сегмент старше segment_seconds: новый сегмент
+    archive.append(make_batch(("cpu", "ram"), [(1015.0, 3.0, 52.0), (1016.0, 4.0, 53.0)]))
+    assert len(archive.segments()) == 2
+    # Другой набор каналов: новый сегмент; первый старше max_age и удаляется
+    archive.append(make_batch(("cpu", "ram", "disk"), [(1040.0, 5.0, 54.0, 7.0)]))
+    archive.close()
+    assert [start for start, _ in archive.segments()] == [1015.0, 1040.0]
+
+    # По умолчанию - каналы нового сегмента; в сегменте без disk строки пропускаются
+    batch = archive.load()
+    assert batch.channels == ["cpu", "ram", "disk"]
+    assert list(batch.rows()) == [(1040.0, array('d', [5.0, 54.0, 7.0]))]
+
+    batch = archive.load(channels=["ram", "cpu"])
+    assert [(timestamp, list(values)) for timestamp, values in batch.rows()] == [
+        (1015.0, [52.0, 3.0]), (1016.0, [53.0, 4.0]), (1040.0, [54.0, 5.0])]
+
+    batch = archive.load(since=1016.0, channels=["cpu"])
+    assert [(timestamp, list(values)) for timestamp, values in batch.rows()] == [(1016.0, [4.0]), (1040.0, [5.0])]
+
+
+def test_archive_ignores_torn_row(tmp_path):
+    archive = MetricsArchive(str(tmp_path))
+    archive.append(make_batch(("cpu",), [(1000.0, 1.0), (1001.0, 2.0)]))
+    archive.file.write(b"\x00" * 12)  # Недописанная при сбое строка
+    archive.close()
+    assert len(archive.load()) == 2
@@ -0,0 +1,48 @@
+"""
+Тесты записи партий: чтение файла, оборванного на любом байте.
+"""
+import io
+import random
+
+import pytest
+
+from exam.game_logic_2048 import GameLogic
+from exam.replay_2048 import HEADER, ReplayReader, ReplayWriter
+
+
+def record_game(size, keyframe_interval, moves=20):
+    """Байты записи и поля со счётом после каждого хода (с начальным)."""
+    logic = GameLogic(rng=random.Random(7), size=size)
+    logic.reset()
+    logic.place_new_tile()
+    logic.place_new_tile()
+    stream = io.BytesIO()
+    writer = ReplayWriter(stream, logic, keyframe_interval=keyframe_interval)
+    states = [([row[:] for row in logic.board], logic.score)]
+    rnd = random.Random(11)
+    while len(states) <= moves and logic.can_move():
+        direction = rnd.choice(('left', 'right', 'up', 'down'))
+        if not logic.move(direction):
+            continue
+        spawn = logic.place_new_tile()
+        writer.record(direction, spawn and (*spawn, logic.board[spawn[0]][spawn[1]]))
+        states.append(([row[:] for row in logic.board], logic.score))
+    return stream.getvalue(), states
+
+
+@pytest.mark.parametrize("size", [3, 4, 5, 8])
+@pytest.mark.parametrize("keyframe_interval", [1, 3])
+def test_truncated_file(size, keyframe_interval):
+    data, states = record_game(size, keyframe_interval)
+    first_keyframe = HEADER.size + 8 + size * size
+    for end in range(first_keyframe, len(data) + 1):
+        reader = ReplayReader(data[:end])
+        logic = reader.state_at(len(reader))
+        assert (logic.board, logic.score) == states[len(reader)]
+    assert len(ReplayReader(data)) == len(states) - 1
+
+
+def test_truncated_first_keyframe():
+    data, _ = record_game(4, 3)
+    with pytest.raises(ValueError):
+        ReplayReader(data[:HEADER.size + 3])
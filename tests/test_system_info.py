@@ -0,0 +1,30 @@
+"""
+Тесты потока SystemInfo: остановка сразу после запуска.
+"""
+from a_threads import SystemInfo
+from metrics_service import MetricsService
+
+
+def test_stop_right_after_start(qapp):
+    for _ in range(50):
+        thread = SystemInfo()
+        thread.start()
+        thread.stop()
+        assert thread.isFinished()
+
+
+def test_restart_after_stop(qapp):
+    thread = SystemInfo()
+    thread.start()
+    thread.stop()
+    thread.start()
+    assert thread.running
+    thread.stop()
+    assert not thread.running
+
+
+def test_subscribe_unsubscribe(qapp):
+    service = MetricsService()
+    for _ in range(20):
+        service.subscribe(lambda batch: None).cancel()
+    assert service.thread is None
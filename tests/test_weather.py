@@ -0,0 +1,83 @@
+"""
+Тесты WeatherHandler с локальным сервером-заглушкой вместо open-meteo.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from a_threads import WeatherHandler
+
+DELAY = 0.05
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive: иначе соединение закрывается после каждого ответа
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((time.monotonic(), self.client_address))
+            status = server.statuses.pop(0) if server.statuses else 200
+        body = json.dumps({"current_weather": {"temperature": 1.5, "windspeed": 3.0}} if status == 200 else {})
+        body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = []
+    server.statuses = [503, 503, 503]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def wait_until(qapp, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.01)
+    qapp.processEvents()
+    return condition()
+
+
+def test_errors_backoff_and_reused_connection(qapp, server):
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1/forecast"
+    handler = WeatherHandler(55.75, 37.62, base_url=base_url, session=requests.Session())
+    handler.setDelay(DELAY)
+    errors, data = [], []
+    handler.errorOccurred.connect(errors.append)
+    handler.weatherDataReceived.connect(data.append)
+    handler.start()
+    try:
+        assert wait_until(qapp, lambda: len(data) >= 2)
+    finally:
+        handler.stop()
+
+    # Три ответа 503 пришли сигналом errorOccurred, затем - данные
+    assert len(errors) == 3 and all("503" in message for message in errors)
+    assert data[0] == {"temperature": 1.5, "windspeed": 3.0}
+    # После n ошибок подряд пауза не меньше половины delay * 2^n
+    times = [moment for moment, _ in server.requests]
+    gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+    for failures, gap in enumerate(gaps[:3], start=1):
+        assert gap >= DELAY * 2 ** failures / 2
+    assert gaps[2] > gaps[0]
+    # Все запросы шли по одному соединению (keep-alive)
+    assert len({address for _, address in server.requests}) == 1